@@ -1,11 +1,17 @@
 # Migrated from: TruthLens/app.py - conduct_forensic_analysis function and related analysis logic
 # Enhanced with "One-in-a-Million" forensic capabilities from requirements
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterable, Optional
 import asyncio
+import copy
+import functools
+import hashlib
+import re
 from datetime import datetime
 import logging
 
+from cachetools import TTLCache
+
 from .text_analysis import TextAnalyzer
 from .image_forensics import ImageForensics
 from .source_tracking import SourceTracker
@@ -16,6 +22,80 @@ from ..utils.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Risk keywords by category and the score each distinct keyword contributes
+RISK_KEYWORDS = {
+    'sensational': (['shocking', 'unbelievable', 'incredible', 'amazing', 'breaking', 'urgent'], 10),
+    'conspiracy': (['conspiracy', 'cover-up', 'hidden truth', 'they don\'t want'], 15),
+    'action': (['share', 'forward', 'spread', 'tell everyone'], 10),
+}
+
+# One scan over the text for every category; the lookahead lets overlapping keywords all match
+_RISK_KEYWORD_RE = re.compile(
+    "(?=" + "|".join(
+        f"(?P<{category}>{'|'.join(map(re.escape, words))})"
+        for category, (words, _) in RISK_KEYWORDS.items()
+    ) + ")",
+    re.IGNORECASE
+)
+_SOURCE_MENTION_RE = re.compile(r"source|study|research", re.IGNORECASE)
+
+# AI response vocabulary: explicit veracity verdicts, then fallback risk indicators
+HIGH_RISK_INDICATORS = frozenset([
+    'false', 'misinformation', 'disinformation', 'fake', 'untrue', 
+    'deceptive', 'manipulative', 'harmful', 'dangerous',
+    'conspiracy', 'hoax', 'scam', 'fraud', 'deceit'
+])
+MEDIUM_RISK_INDICATORS = frozenset([
+    'questionable', 'suspicious', 'unreliable', 
+    'biased', 'exaggerated', 'incomplete', 'outdated'
+])
+_VERDICT_RE = re.compile(r"(?=(false information|misleading|unverified|veracity assessment|true))")
+_HIGH_RISK_RE = re.compile("|".join(sorted(HIGH_RISK_INDICATORS)))
+_MEDIUM_RISK_RE = re.compile("|".join(sorted(MEDIUM_RISK_INDICATORS)))
+
+# Recommendations by (audience, risk bucket); buckets are > 70 high, > 40 medium, else low
+RECOMMENDATIONS = {
+    # Authority-specific recommendations
+    ("authority", "high"): (
+        "🚨 HIGH RISK: Immediate monitoring recommended",
+        "📊 Track spread patterns across platforms", 
+        "🔔 Consider issuing public alert if widespread",
+        "📧 Coordinate with fact-checking organizations",
+        "📋 Document for trend analysis"
+    ),
+    ("authority", "medium"): (
+        "⚠️ MEDIUM RISK: Continue monitoring",
+        "📊 Add to watch list for pattern analysis",
+        "🔍 Verify with additional sources",
+        "📧 Share with relevant departments"
+    ),
+    ("authority", "low"): (
+        "✅ LOW RISK: Standard monitoring sufficient",
+        "📊 Log for baseline data"
+    ),
+    # Public user recommendations
+    ("public", "high"): (
+        "🚨 HIGH RISK: Do not share this content",
+        "🔍 Verify information from multiple credible sources",
+        "📧 Report this content to relevant authorities",
+        "📚 Learn about misinformation tactics"
+    ),
+    ("public", "medium"): (
+        "⚠️ MEDIUM RISK: Be cautious about sharing",
+        "🔍 Cross-check with fact-checking websites",
+        "📚 Look for additional context and sources",
+        "⏳ Wait for more information before sharing"
+    ),
+    ("public", "low"): (
+        "✅ LOW RISK: Content appears credible",
+        "🔍 Still verify with additional sources if important",
+        "📚 Continue learning about information verification"
+    ),
+}
+
+# Completed analyses keyed by request fingerprint, so duplicate submissions skip the pipeline
+_RESULT_CACHE = TTLCache(maxsize=1024, ttl=420)
+
 class ComprehensiveAnalyzer:
     """
     Main orchestrator for comprehensive forensic analysis
@@ -32,6 +112,27 @@ class ComprehensiveAnalyzer:
         self.security_service = SecurityService()
         self.config = Config()
 
+@functools.lru_cache(maxsize=1)
+def _get_analyzer() -> ComprehensiveAnalyzer:
+    """
+    Shared analyzer instance, built once per process
+    Sub-services hold only read-only configuration and SDK clients, so they are safe to reuse
+    """
+    return ComprehensiveAnalyzer()
+
+def reset_analyzer() -> None:
+    """Drop the shared analyzer so the next request rebuilds it (tests, config reload)"""
+    _get_analyzer.cache_clear()
+
+def clear_result_cache() -> None:
+    """Forget all memoized analysis results"""
+    _RESULT_CACHE.clear()
+
+def _result_cache_key(text: str, *options: Any) -> bytes:
+    """Fingerprint of the content and every option that affects the analysis output"""
+    fingerprint = "|".join(map(str, options)) + "|" + text
+    return hashlib.blake2b(fingerprint.encode(), digest_size=16).digest()
+
 async def conduct_comprehensive_analysis(
     text: str,
     language: str = "en",
@@ -60,6 +161,14 @@ async def conduct_comprehensive_analysis(
         Comprehensive analysis results dictionary
     """
     
+    cache_key = _result_cache_key(
+        text, language, level, enable_context, track_origin, safety_check, user_type
+    )
+    cached = _RESULT_CACHE.get(cache_key)
+    if cached is not None:
+        logger.info("Returning cached analysis result")
+        return copy.deepcopy(cached)
+    
     # Initialize results structure
     results = {
         'risk_score': 0,
@@ -80,96 +189,142 @@ async def conduct_comprehensive_analysis(
         'spread_pattern_analysis': None
     }
     
+    # Degenerate inputs cannot be meaningfully analyzed, so skip all network fan-out
+    if len(text.strip()) < Config.MIN_TEXT_LENGTH:
+        results.update({
+            'credibility_score': 50,
+            'threat_level': 'LOW',
+            'ai_analysis': "Input too short for analysis"
+        })
+        return results
+    
     try:
-        # Initialize comprehensive analyzer
-        analyzer = ComprehensiveAnalyzer()
+        # Reuse the shared comprehensive analyzer
+        analyzer = _get_analyzer()
         
         # Phase 1: Basic Risk Assessment (from TruthLens)
         results['risk_score'] = await calculate_risk_score(text)
-        logger.info(f"Basic risk score calculated: {results['risk_score']}")
+        logger.info("Basic risk score calculated: %s", results['risk_score'])
         
-        # Phase 2: Security Analysis (from TruthLens security service)
+        # Phases 2-5 have no data dependencies on each other, so dispatch them
+        # concurrently and merge their outputs once they have all completed
+        phases = {}
         if safety_check:
-            results['safety_analysis'] = analyzer.security_service.check_content_safety(text)
-            results['structure_analysis'] = analyzer.security_service.analyze_text_structure(text)
-            
-            manipulation_results = analyzer.security_service.detect_manipulation_patterns(text)
-            results['manipulation_tactics'] = list(manipulation_results['patterns'].keys())
-            
-            # Adjust risk score based on security analysis
-            results['risk_score'] = max(results['risk_score'], manipulation_results['manipulation_score'])
-            logger.info(f"Security-adjusted risk score: {results['risk_score']}")
+            # Phase 2: Security Analysis (from TruthLens security service)
+            phases['safety'] = _run_safety_phase(analyzer, text)
         
         # Phase 3: AI Analysis with Gemini (ALWAYS run - from TruthLens)
-        try:
-            ai_analysis_result = await analyzer.text_analyzer.forensic_analysis(text, language)
-            results['ai_analysis'] = ai_analysis_result['analysis']
-            results['source_links'] = ai_analysis_result['sources']
-            results['reporting_emails'] = ai_analysis_result['reporting_emails']
-            
-            # Update risk score based on AI analysis
-            ai_risk_adjustment = await analyze_ai_response_for_risk(results['ai_analysis'])
-            results['risk_score'] = max(results['risk_score'], ai_risk_adjustment)
-            logger.info(f"AI-adjusted risk score: {results['risk_score']}")
-            
-        except Exception as e:
-            logger.warning(f"AI analysis failed: {str(e)}")
-            results['ai_analysis'] = f"AI analysis temporarily unavailable: {str(e)}"
-            results['source_links'] = []
-            results['reporting_emails'] = []
+        phases['ai'] = _run_ai_phase(analyzer, text, language)
         
         # Phase 4: Fact Checking (from TruthLens FactCheckService)
-        try:
-            results['fact_checks'] = await analyzer.text_analyzer.search_fact_checks(text)
-            logger.info(f"Found {len(results['fact_checks'])} fact checks")
-        except Exception as e:
-            logger.warning(f"Fact checking failed: {str(e)}")
-            results['fact_checks'] = []
+        phases['fact_checks'] = analyzer.text_analyzer.lookup_fact_checks(text)
         
         # Phase 5: Enhanced Forensic Analysis (NEW - One-in-a-Million features)
-        
         if level == "Deep Forensics" or user_type == "authority":
             
             # Origin Tracking & Source Analysis
             if track_origin:
-                try:
-                    results['origin_analysis'] = await analyzer.source_tracker.trace_origin(text)
-                    results['forensic_timeline'] = await analyzer.source_tracker.build_timeline(text)
-                    logger.info("Origin analysis completed")
-                except Exception as e:
-                    logger.warning(f"Origin tracking failed: {str(e)}")
-                    results['origin_analysis'] = f"Origin tracking unavailable: {str(e)}"
+                phases['origin'] = analyzer.source_tracker.trace_origin(text)
+                phases['timeline'] = analyzer.source_tracker.build_timeline(text)
             
             # Context Analysis & Historical Correlation
             if enable_context:
-                try:
-                    results['context_analysis'] = await analyzer.context_analyzer.analyze_context(text)
-                    logger.info("Context analysis completed")
-                except Exception as e:
-                    logger.warning(f"Context analysis failed: {str(e)}")
-                    results['context_analysis'] = f"Context analysis unavailable: {str(e)}"
+                phases['context'] = _run_context_phase(analyzer, text)
             
             # Advanced Tactics Breakdown (psychological manipulation detection)
-            try:
-                tactics_result = await analyzer.tactics_analyzer.analyze_manipulation_tactics(text)
+            phases['tactics'] = analyzer.tactics_analyzer.analyze_manipulation_tactics(text)
+        
+        outcomes = dict(zip(phases, await asyncio.gather(*phases.values(), return_exceptions=True)))
+        
+        # Results built around a failed phase or an upstream fallback are returned but never memoized,
+        # so a transient Gemini/Fact Check outage is retried on the next submission
+        degraded = any(isinstance(outcome, Exception) for outcome in outcomes.values())
+        
+        if 'safety' in outcomes:
+            safety = outcomes['safety']
+            if isinstance(safety, Exception):
+                raise safety
+            results['safety_analysis'], results['structure_analysis'], manipulation_results = safety
+            _add_tactics(results['manipulation_tactics'], manipulation_results['patterns'])
+            
+            # Adjust risk score based on security analysis
+            results['risk_score'] = max(results['risk_score'], manipulation_results['manipulation_score'])
+            logger.info("Security-adjusted risk score: %s", results['risk_score'])
+        
+        ai_outcome = outcomes['ai']
+        if isinstance(ai_outcome, Exception):
+            logger.warning("AI analysis failed: %s", ai_outcome)
+            results['ai_analysis'] = f"AI analysis temporarily unavailable: {str(ai_outcome)}"
+            results['source_links'] = []
+            results['reporting_emails'] = []
+        else:
+            ai_analysis_result, ai_risk_adjustment = ai_outcome
+            degraded = degraded or ai_analysis_result.get('fallback', False)
+            results['ai_analysis'] = ai_analysis_result['analysis']
+            results['source_links'] = ai_analysis_result['sources']
+            results['reporting_emails'] = ai_analysis_result['reporting_emails']
+            
+            # Update risk score based on AI analysis
+            results['risk_score'] = max(results['risk_score'], ai_risk_adjustment)
+            logger.info("AI-adjusted risk score: %s", results['risk_score'])
+        
+        fact_checks = outcomes['fact_checks']
+        if isinstance(fact_checks, Exception) or fact_checks is None:
+            logger.warning("Fact checking failed: %s", fact_checks)
+            degraded = True
+            results['fact_checks'] = []
+        else:
+            results['fact_checks'] = fact_checks
+            logger.info("Found %d fact checks", len(results['fact_checks']))
+        
+        if 'origin' in outcomes:
+            origin_failure = next(
+                (o for o in (outcomes['origin'], outcomes['timeline']) if isinstance(o, Exception)),
+                None
+            )
+            if origin_failure:
+                logger.warning("Origin tracking failed: %s", origin_failure)
+                results['origin_analysis'] = f"Origin tracking unavailable: {str(origin_failure)}"
+            else:
+                results['origin_analysis'] = outcomes['origin']
+                results['forensic_timeline'] = outcomes['timeline']
+                logger.info("Origin analysis completed")
+        
+        if 'context' in outcomes:
+            context = outcomes['context']
+            if isinstance(context, Exception):
+                logger.warning("Context analysis failed: %s", context)
+                results['context_analysis'] = f"Context analysis unavailable: {str(context)}"
+            else:
+                results['context_analysis'] = context
+                logger.info("Context analysis completed")
+        
+        if 'tactics' in outcomes:
+            tactics_result = outcomes['tactics']
+            if isinstance(tactics_result, Exception):
+                logger.warning("Tactics analysis failed: %s", tactics_result)
+            else:
                 results['psychological_analysis'] = tactics_result['psychological_analysis']
-                results['manipulation_tactics'].extend(tactics_result['advanced_tactics'])
+                _add_tactics(results['manipulation_tactics'], tactics_result['advanced_tactics'])
                 results['spread_pattern_analysis'] = tactics_result['spread_analysis']
                 logger.info("Advanced tactics analysis completed")
-            except Exception as e:
-                logger.warning(f"Tactics analysis failed: {str(e)}")
         
         # Phase 6: Final Score Calculation and Threat Assessment
         results['credibility_score'] = await calculate_credibility_score(results)
         results['threat_level'] = determine_threat_level(results['risk_score'])
-        results['recommendations'] = await generate_recommendations(results, user_type)
+        results['recommendations'] = generate_recommendations(results, user_type)
         
-        logger.info(f"Analysis completed - Risk: {results['risk_score']}, Credibility: {results['credibility_score']}, Threat: {results['threat_level']}")
+        logger.info(
+            "Analysis completed - Risk: %s, Credibility: %s, Threat: %s",
+            results['risk_score'], results['credibility_score'], results['threat_level']
+        )
         
+        if not degraded:
+            _RESULT_CACHE[cache_key] = copy.deepcopy(results)
         return results
         
     except Exception as e:
-        logger.error(f"Comprehensive analysis failed: {str(e)}")
+        logger.error("Comprehensive analysis failed: %s", e)
         # Return basic results even if advanced analysis fails
         results['ai_analysis'] = f"Analysis error: {str(e)}"
         results['credibility_score'] = 50  # Neutral score on error
@@ -177,43 +332,58 @@ async def conduct_comprehensive_analysis(
         results['recommendations'] = ["Unable to complete analysis. Please try again later."]
         return results
 
+async def _run_safety_phase(analyzer: ComprehensiveAnalyzer, text: str) -> tuple:
+    """Run the blocking SecurityService checks (Phase 2) concurrently on the default thread pool"""
+    security_service = analyzer.security_service
+    return tuple(await asyncio.gather(
+        asyncio.to_thread(security_service.check_content_safety, text),
+        asyncio.to_thread(security_service.analyze_text_structure, text),
+        asyncio.to_thread(security_service.detect_manipulation_patterns, text)
+    ))
+
+def _add_tactics(tactics: List[str], new_tactics: Iterable[str]) -> None:
+    """Append newly detected tactics, skipping duplicates and the "None Detected" placeholder"""
+    seen = set(tactics)
+    seen.add("None Detected")
+    for tactic in new_tactics:
+        if tactic not in seen:
+            seen.add(tactic)
+            tactics.append(tactic)
+
+async def _run_ai_phase(analyzer: ComprehensiveAnalyzer, text: str, language: str) -> tuple:
+    """Run Gemini forensic analysis and derive its risk adjustment (Phase 3)"""
+    ai_analysis_result = await analyzer.text_analyzer.forensic_analysis(text, language)
+    ai_risk_adjustment = analyze_ai_response_for_risk(ai_analysis_result['analysis'])
+    return ai_analysis_result, ai_risk_adjustment
+
+async def _run_context_phase(analyzer: ComprehensiveAnalyzer, text: str) -> Any:
+    """Run contextual analysis (Phase 5) so lookup errors surface as a phase failure"""
+    return await analyzer.context_analyzer.analyze_context(text)
+
 async def calculate_risk_score(text: str) -> int:
     """
     Calculate basic risk score
     Migrated from: TruthLens/app.py - calculate_risk_score()
     """
     score = 0
-    text_lower = text.lower()
-    
-    # Check for sensational language
-    sensational_words = ['shocking', 'unbelievable', 'incredible', 'amazing', 'breaking', 'urgent']
-    for word in sensational_words:
-        if word in text_lower:
-            score += 10
     
-    # Check for conspiracy indicators
-    conspiracy_words = ['conspiracy', 'cover-up', 'hidden truth', 'they don\'t want']
-    for word in conspiracy_words:
-        if word in text_lower:
-            score += 15
+    # Sensational language, conspiracy indicators and calls to action (each keyword counted once)
+    matched_keywords = {}
+    for match in _RISK_KEYWORD_RE.finditer(text):
+        matched_keywords.setdefault(match.group(match.lastgroup).lower(), match.lastgroup)
+    score += sum(RISK_KEYWORDS[category][1] for category in matched_keywords.values())
     
     # Check for lack of sources
-    if 'source' not in text_lower and 'study' not in text_lower and 'research' not in text_lower:
+    if not _SOURCE_MENTION_RE.search(text):
         score += 20
     
     # Check for excessive punctuation
     if text.count('!') > 3 or text.count('?') > 3:
         score += 10
     
-    # Check for call to action
-    action_words = ['share', 'forward', 'spread', 'tell everyone']
-    for word in action_words:
-        if word in text_lower:
-            score += 10
-    
     return min(100, score)
 
-async def analyze_ai_response_for_risk(ai_response: str) -> int:
+def analyze_ai_response_for_risk(ai_response: str) -> int:
     """
     Analyze AI response to determine risk level
     Migrated from: TruthLens/app.py - analyze_ai_response_for_risk()
@@ -223,36 +393,21 @@ async def analyze_ai_response_for_risk(ai_response: str) -> int:
     
     response_lower = str(ai_response).lower()
     
-    # Check for explicit veracity assessment from AI
-    if 'false information' in response_lower:
+    # Check for explicit veracity assessment from AI (one scan, then apply precedence)
+    verdicts = {m.group(1) for m in _VERDICT_RE.finditer(response_lower)}
+    if 'false information' in verdicts:
         return 90  # Very high risk for false information
-    elif 'misleading' in response_lower:
+    elif 'misleading' in verdicts:
         return 80  # High risk for misleading content
-    elif 'unverified' in response_lower:
+    elif 'unverified' in verdicts:
         return 60  # Medium-high risk for unverified content
-    elif 'true' in response_lower and 'veracity assessment' in response_lower:
+    elif 'true' in verdicts and 'veracity assessment' in verdicts:
         return 10  # Low risk for verified true content
     
     # Fallback to keyword analysis
-    high_risk_indicators = [
-        'false', 'misinformation', 'disinformation', 'fake', 'untrue', 
-        'deceptive', 'manipulative', 'harmful', 'dangerous',
-        'conspiracy', 'hoax', 'scam', 'fraud', 'deceit'
-    ]
-    
-    medium_risk_indicators = [
-        'questionable', 'suspicious', 'unreliable', 
-        'biased', 'exaggerated', 'incomplete', 'outdated'
-    ]
-    
-    # Check for high risk indicators
-    high_risk_count = sum(1 for indicator in high_risk_indicators if indicator in response_lower)
-    medium_risk_count = sum(1 for indicator in medium_risk_indicators if indicator in response_lower)
-    
-    # Calculate risk score based on AI assessment
-    if high_risk_count > 0:
+    if _HIGH_RISK_RE.search(response_lower):
         return 75  # High risk for concerning factors
-    elif medium_risk_count > 0:
+    elif _MEDIUM_RISK_RE.search(response_lower):
         return 50  # Medium risk
     else:
         return 0  # No additional risk from AI analysis
@@ -273,7 +428,7 @@ async def calculate_credibility_score(results: Dict[str, Any]) -> int:
         credibility = (credibility + safety_score) / 2
     
     # Factor in manipulation tactics
-    manipulation_count = len([t for t in results['manipulation_tactics'] if t != "None Detected"])
+    manipulation_count = len(results['manipulation_tactics'])
     credibility -= manipulation_count * 10
     
     # Factor in fact checks
@@ -291,67 +446,23 @@ def determine_threat_level(risk_score: int) -> str:
     else:
         return "LOW"
 
-async def generate_recommendations(results: Dict[str, Any], user_type: str) -> List[str]:
+def generate_recommendations(results: Dict[str, Any], user_type: str) -> List[str]:
     """
     Generate recommendations based on analysis
     Migrated from: TruthLens/app.py - generate_recommendations()
     Enhanced with user-type specific recommendations
     """
-    recommendations = []
     risk_score = results['risk_score']
+    audience = "authority" if user_type == "authority" else "public"
+    bucket = "high" if risk_score > 70 else "medium" if risk_score > 40 else "low"
     
-    if user_type == "authority":
-        # Authority-specific recommendations
-        if risk_score > 70:
-            recommendations.extend([
-                "🚨 HIGH RISK: Immediate monitoring recommended",
-                "📊 Track spread patterns across platforms", 
-                "🔔 Consider issuing public alert if widespread",
-                "📧 Coordinate with fact-checking organizations",
-                "📋 Document for trend analysis"
-            ])
-        elif risk_score > 40:
-            recommendations.extend([
-                "⚠️ MEDIUM RISK: Continue monitoring",
-                "📊 Add to watch list for pattern analysis",
-                "🔍 Verify with additional sources",
-                "📧 Share with relevant departments"
-            ])
-        else:
-            recommendations.extend([
-                "✅ LOW RISK: Standard monitoring sufficient",
-                "📊 Log for baseline data"
-            ])
-    else:
-        # Public user recommendations
-        if risk_score > 70:
-            recommendations.extend([
-                "🚨 HIGH RISK: Do not share this content",
-                "🔍 Verify information from multiple credible sources",
-                "📧 Report this content to relevant authorities",
-                "📚 Learn about misinformation tactics"
-            ])
-        elif risk_score > 40:
-            recommendations.extend([
-                "⚠️ MEDIUM RISK: Be cautious about sharing",
-                "🔍 Cross-check with fact-checking websites",
-                "📚 Look for additional context and sources",
-                "⏳ Wait for more information before sharing"
-            ])
-        else:
-            recommendations.extend([
-                "✅ LOW RISK: Content appears credible",
-                "🔍 Still verify with additional sources if important",
-                "📚 Continue learning about information verification"
-            ])
-    
-    return recommendations
+    return list(RECOMMENDATIONS[(audience, bucket)])
 
 async def test_all_services() -> Dict[str, bool]:
     """
     Test all analysis services for health checks
     """
-    analyzer = ComprehensiveAnalyzer()
+    analyzer = _get_analyzer()
     
     services_status = {}
     
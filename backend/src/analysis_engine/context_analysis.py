@@ -1,19 +1,30 @@
 # backend/src/analysis_engine/context_analysis.py
 
 import asyncio
+import copy
+import hashlib
+import json
 import logging
 import os
 import re
 from collections import Counter
 from dataclasses import dataclass
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta, timezone
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, TypedDict
+
+from cachetools import TTLCache
 
 try:
     import google.generativeai as genai  # optional
 except Exception:  # pragma: no cover
     genai = None  # gracefully degrade if not installed
 
+try:
+    import ahocorasick  # optional (pyahocorasick)
+except Exception:  # pragma: no cover
+    ahocorasick = None  # fall back to per-keyword substring scans
+
 logger = logging.getLogger(__name__)
 
 INDIA_SENSITIVE_KEYWORDS = [
@@ -33,24 +44,67 @@ INDIA_SENSITIVE_KEYWORDS = [
     "breaking", "urgent", "forward", "share", "viral", "alert",
 ]
 
+def _build_keyword_automaton(keywords: List[str]):
+    """Single-pass multi-keyword matcher; None when pyahocorasick is unavailable."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for kw in keywords:
+        automaton.add_word(kw, kw)
+    automaton.make_automaton()
+    return automaton
+
 RELATIVE_TIME_TERMS = [
     "today", "yesterday", "tonight", "this morning", "this evening",
     "last night", "breaking", "just now", "urgent", "immediately",
 ]
 
+# Keyword tokenizer, plus the fixed phrases located in one pass over the normalized text
+_TOKEN_RE = re.compile(r"[a-zA-Z][a-zA-Z\-]{2,}")
+_CONTEXT_PHRASES = list(dict.fromkeys(INDIA_SENSITIVE_KEYWORDS + RELATIVE_TIME_TERMS))
+_PHRASE_AUTOMATON = _build_keyword_automaton(_CONTEXT_PHRASES)
+
 MONTHS = (
     "january","february","march","april","may","june",
     "july","august","september","october","november","december"
 )
+_MONTH_MAP = {m: i + 1 for i, m in enumerate(MONTHS)}
+
+# Temporal patterns, compiled once
+# Numeric dates: 07/09/2025 or 07-09-2025
+_NUMERIC_DATE_RE = re.compile(r"\b(\d{1,2})[\/\-](\d{1,2})[\/\-](\d{2,4})\b")
+# Month name forms: 7 September 2025 | September 7, 2025
+_MONTHNAME_DATE_RE = re.compile(
+    r"\b(?:(\d{1,2})\s+([a-z]+)\s+(\d{4})|([a-z]+)\s+(\d{1,2}),\s*(\d{4}))\b"
+)
+
+# analyze() result when the analyzer is switched off
+_DISABLED_RESULT = MappingProxyType({"enabled": False, "confidence": 0.0})
 
-STOPWORDS = set((
+# analyze() results keyed by normalized-text hash and analyzer configuration
+_CONTEXT_CACHE = TTLCache(maxsize=1024, ttl=420)
+
+STOPWORDS = frozenset((
     "the","a","an","and","or","but","if","then","else","on","in","at","to","for","of",
     "from","by","with","as","is","are","was","were","be","been","it","this","that",
     "these","those","i","we","you","he","she","they","them","his","her","their",
     "our","your","not","no","yes"
 ))
 
+class _GeminiContextSummary(TypedDict):
+    """Response schema for the Gemini context summary (JSON mode)."""
+    key_topics: List[str]
+    likely_domain: str
+    risk_triggers: List[str]
+    recommended_checks: List[str]
+
 @dataclass
+class _TextScan:
+    keywords: List[str]
+    sensitive_hits: List[str]
+    relative_terms: List[str]
+
+@dataclass(frozen=True, slots=True)
 class ContextAnalyzerConfig:
     enabled: bool = True
     use_gemini: bool = True
@@ -74,19 +128,19 @@ class ContextAnalyzer:
     def __init__(self, config: Dict[str, Any] | None = None):
         cfg = config or {}
         self.config = ContextAnalyzerConfig(
-            enabled=cfg.get("enabled", True),
-            use_gemini=cfg.get("use_gemini", True),
-            model=cfg.get("model", "gemini-1.5-flash"),
-            max_keywords=cfg.get("max_keywords", 12),
-            recency_days=cfg.get("recency_days", 14),
+            **{k: v for k, v in cfg.items() if k in ContextAnalyzerConfig.__dataclass_fields__}
         )
 
         self.google_api_key = os.getenv("GOOGLE_API_KEY")
         self.gemini = None
+        # In-flight Gemini calls by prompt hash, shared by concurrent identical requests
+        self._gemini_inflight: Dict[bytes, asyncio.Task] = {}
         if self.config.use_gemini and self.google_api_key and genai:
             try:
                 genai.configure(api_key=self.google_api_key)
-                self.gemini = genai.GenerativeModel(self.config.model)
+                self.gemini = genai.GenerativeModel(
+                    self.config.model, generation_config=self._json_generation_config()
+                )
                 logger.info("ContextAnalyzer: Gemini model initialized")
             except Exception as e:  # pragma: no cover
                 logger.warning(f"ContextAnalyzer: Gemini init failed: {e}")
@@ -94,27 +148,55 @@ class ContextAnalyzer:
 
     async def analyze(self, text: str, context: Dict[str, Any] | None = None) -> Dict[str, Any]:
         if not self.config.enabled:
-            return {"enabled": False, "confidence": 0.0}
+            return dict(_DISABLED_RESULT)
+
+        if not text or text.isspace():
+            return self._build_result([], [], [], [], None)
 
         norm = self._normalize_text(text)
-        keywords = self._extract_keywords(norm, self.config.max_keywords)
-        dates, relative_terms = self._extract_temporal_signals(norm)
-        sensitive_hits = self._detect_sensitive_hits(norm)
+        cache_key = (
+            hashlib.blake2b(norm.encode(), digest_size=16).digest(),
+            self.config,
+            self.gemini is not None,
+        )
+        cached = _CONTEXT_CACHE.get(cache_key)
+        if cached is not None:
+            return copy.deepcopy(cached)
 
-        # Heuristic correlation: higher risk if sensitive + recent/time-pressured language
-        events_corr = self._correlate_events(dates, relative_terms, sensitive_hits)
+        scan = self._scan_text(norm)
+        keywords, sensitive_hits, relative_terms = scan.keywords, scan.sensitive_hits, scan.relative_terms
+        dates = self._extract_temporal_signals(norm)
 
         gemini_context = None
+        summarize_failed = False
         if self.gemini:
             try:
                 gemini_context = await self._gemini_context_summarize(text, keywords, dates, sensitive_hits)
             except Exception as e:  # pragma: no cover
                 logger.warning(f"ContextAnalyzer: Gemini summarize failed: {e}")
+                summarize_failed = True
+
+        result = self._build_result(keywords, dates, relative_terms, sensitive_hits, gemini_context)
+        # A result missing its summary because of a Gemini failure is not memoized, so the next call retries
+        if not summarize_failed:
+            _CONTEXT_CACHE[cache_key] = copy.deepcopy(result)
+        return result
+
+    def _build_result(
+        self,
+        keywords: List[str],
+        dates: List[datetime],
+        relative_terms: List[str],
+        sensitive_hits: List[str],
+        gemini_context: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        # Heuristic correlation: higher risk if sensitive + recent/time-pressured language
+        events_corr = self._correlate_events(dates, relative_terms, sensitive_hits)
 
-        result = {
+        return {
             "topics": keywords,
             "temporal_indicators": {
-                "dates_found": [d.isoformat() for d in dates],
+                "dates_found": dates,  # datetimes; the JSON layer renders them as ISO 8601
                 "relative_time_terms": relative_terms,
                 "recent_within_days": self.config.recency_days,
             },
@@ -130,7 +212,11 @@ class ContextAnalyzer:
                 "gemini": gemini_context is not None
             })
         }
-        return result
+
+    @staticmethod
+    def cache_clear() -> None:
+        """Forget all memoized analyze() results."""
+        _CONTEXT_CACHE.clear()
 
     def get_confidence_score(self, data: Dict[str, Any]) -> float:
         score = 0.3  # base
@@ -148,82 +234,78 @@ class ContextAnalyzer:
 
     # ---------------- internal helpers ----------------
 
-    def _normalize_text(self, text: str) -> str:
-        return re.sub(r"\s+", " ", text).strip().lower()
-
-    def _extract_keywords(self, text: str, k: int) -> List[str]:
-        tokens = re.findall(r"[a-zA-Z][a-zA-Z\-]{2,}", text)
-        tokens = [t for t in tokens if t not in STOPWORDS]
-        freq = Counter(tokens)
-        return [w for w, _ in freq.most_common(k)]
+    @staticmethod
+    def _json_generation_config() -> Any:
+        """Ask Gemini for schema-constrained JSON; None on SDKs without structured output."""
+        try:
+            return genai.GenerationConfig(
+                response_mime_type="application/json",
+                response_schema=_GeminiContextSummary,
+            )
+        except Exception as e:  # pragma: no cover
+            logger.warning(f"ContextAnalyzer: JSON output mode unavailable: {e}")
+            return None
 
-    def _extract_temporal_signals(self, text: str) -> tuple[List[datetime], List[str]]:
-        dates: List[datetime] = []
-        relative_found: List[str] = []
+    def _normalize_text(self, text: str) -> str:
+        # str.split() splits on the same Unicode whitespace as \s and drops the ends
+        return " ".join(text.lower().split())
+
+    def _scan_text(self, text: str) -> _TextScan:
+        """Keywords from one tokenizer pass; sensitive hits and relative terms from one phrase pass."""
+        freq = Counter(t for t in _TOKEN_RE.findall(text) if t not in STOPWORDS)
+        if _PHRASE_AUTOMATON is not None:
+            found = {phrase for _, phrase in _PHRASE_AUTOMATON.iter(text)}
+        else:
+            found = {phrase for phrase in _CONTEXT_PHRASES if phrase in text}
+        return _TextScan(
+            keywords=[w for w, _ in freq.most_common(self.config.max_keywords)],
+            # de-duplicate while preserving keyword order
+            sensitive_hits=[kw for kw in dict.fromkeys(INDIA_SENSITIVE_KEYWORDS) if kw in found],
+            relative_terms=[term for term in RELATIVE_TIME_TERMS if term in found],
+        )
 
-        # Relative time terms
-        for term in RELATIVE_TIME_TERMS:
-            if term in text:
-                relative_found.append(term)
+    def _extract_temporal_signals(self, text: str) -> List[datetime]:
+        # (year, month, day) keys in first-seen order; the same date in several formats counts once
+        found: Dict[tuple, None] = {}
 
         # Numeric dates: 07/09/2025 or 07-09-2025
-        for m in re.finditer(r"\b(\d{1,2})[\/\-](\d{1,2})[\/\-](\d{2,4})\b", text):
+        for m in _NUMERIC_DATE_RE.finditer(text):
             d, mth, y = int(m.group(1)), int(m.group(2)), int(m.group(3))
             if y < 100:  # yy -> 20yy
                 y += 2000
+            found[(y, mth, d)] = None
+
+        # Month name forms: 7 september 2025, september 7, 2025
+        for m in _MONTHNAME_DATE_RE.finditer(text):
+            if m.group(1):
+                day, mon, year = m.group(1), m.group(2), m.group(3)
+            else:
+                mon, day, year = m.group(4), m.group(5), m.group(6)
+            if mon in _MONTH_MAP:
+                found[(int(year), _MONTH_MAP[mon], int(day))] = None
+
+        dates: List[datetime] = []
+        for y, mth, d in found:
             try:
                 dates.append(datetime(y, mth, d))
             except ValueError:
                 pass
-
-        # Month name forms: 7 September 2025, September 7, 2025
-        month_map = {m: i + 1 for i, m in enumerate(MONTHS)}
-        # 7 september 2025
-        for m in re.finditer(r"\b(\d{1,2})\s+([a-z]+)\s+(\d{4})\b", text):
-            day, mon, year = int(m.group(1)), m.group(2), int(m.group(3))
-            if mon in month_map:
-                try:
-                    dates.append(datetime(year, month_map[mon], day))
-                except ValueError:
-                    pass
-        # september 7, 2025
-        for m in re.finditer(r"\b([a-z]+)\s+(\d{1,2}),\s*(\d{4})\b", text):
-            mon, day, year = m.group(1), int(m.group(2)), int(m.group(3))
-            if mon in month_map:
-                try:
-                    dates.append(datetime(year, month_map[mon], day))
-                except ValueError:
-                    pass
-
-        return dates, relative_found
-
-    def _detect_sensitive_hits(self, text: str) -> List[str]:
-        hits = []
-        for kw in INDIA_SENSITIVE_KEYWORDS:
-            if kw in text:
-                hits.append(kw)
-        # de-duplicate while preserving order
-        seen = set()
-        unique = []
-        for h in hits:
-            if h not in seen:
-                unique.append(h)
-                seen.add(h)
-        return unique
+        return dates
 
     def _correlate_events(
         self, dates: List[datetime], relative_terms: List[str], sensitive_hits: List[str]
     ) -> Dict[str, Any]:
-        now = datetime.utcnow()
+        # Extracted dates are naive UTC, so compare against a naive UTC cutoff
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
         recent_cutoff = now - timedelta(days=self.config.recency_days)
-        recent_dates = [d for d in dates if d >= recent_cutoff]
+        recent_count = sum(1 for d in dates if d >= recent_cutoff)
 
         score = 0
         if sensitive_hits:
             score += 2
         if relative_terms:
             score += 1
-        if recent_dates:
+        if recent_count:
             score += 1
 
         if score >= 3:
@@ -240,7 +322,7 @@ class ContextAnalyzer:
             "signals": {
                 "sensitive_hits_count": len(sensitive_hits),
                 "relative_terms_count": len(relative_terms),
-                "recent_dates_count": len(recent_dates),
+                "recent_dates_count": recent_count,
             },
         }
 
@@ -270,16 +352,25 @@ class ContextAnalyzer:
         Sensitive hits: {hits[:10]}
         """
 
-        resp = await asyncio.to_thread(self.gemini.generate_content, prompt)
+        resp = await self._generate_coalesced(prompt)
         raw = getattr(resp, "text", "") or ""
-        # Try to extract JSON
-        m = re.search(r"\{.*\}", raw, re.DOTALL)
-        if not m:
-            return {"raw": raw.strip()[:1000]}
         try:
-            import json
-            return json.loads(m.group(0))
-        except Exception:
+            return json.loads(raw)
+        except ValueError:
             return {"raw": raw.strip()[:1000]}
 
+    async def _generate_coalesced(self, prompt: str) -> Any:
+        """
+        Run generate_content, joining an identical call that is already in flight.
+        Distinct prompts are never merged, so one request's content cannot leak into another's.
+        """
+        key = hashlib.blake2b(prompt.encode(), digest_size=16).digest()
+        task = self._gemini_inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(asyncio.to_thread(self.gemini.generate_content, prompt))
+            self._gemini_inflight[key] = task
+            task.add_done_callback(lambda _: self._gemini_inflight.pop(key, None))
+        # shield: one caller being cancelled must not cancel the call for the others
+        return await asyncio.shield(task)
+
 __all__ = ["ContextAnalyzer", "ContextAnalyzerConfig"]
@@ -2,21 +2,198 @@
 
 import asyncio
 import aiohttp
+import copy
 import hashlib
 import json
-import base64
-from datetime import datetime
-from typing import Dict, List, Any, Optional
-from PIL import Image
-from PIL.ExifTags import TAGS
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Dict, List, Any, Optional, Tuple, TypedDict
+import numpy as np
+from PIL import Image, ImageChops, ImageStat
+from PIL.ExifTags import Base
 import google.generativeai as genai
 from google.cloud import vision
 import io
 import os
 import logging
+from cachetools import LRUCache
+
+try:
+    import cv2  # optional (opencv-contrib-python-headless)
+except Exception:  # pragma: no cover
+    cv2 = None  # perceptual pHash is skipped; dhash is still produced
+
+try:
+    import ahocorasick  # optional (pyahocorasick)
+except Exception:  # pragma: no cover
+    ahocorasick = None  # fall back to per-pattern substring scans
 
 logger = logging.getLogger(__name__)
 
+# Every Vision feature the forensics report uses, requested together in one annotate call
+VISION_FEATURES = [
+    vision.Feature.Type.OBJECT_LOCALIZATION,
+    vision.Feature.Type.LABEL_DETECTION,
+    vision.Feature.Type.FACE_DETECTION,
+    vision.Feature.Type.LOGO_DETECTION,
+    vision.Feature.Type.WEB_DETECTION,
+    vision.Feature.Type.TEXT_DETECTION,
+]
+
+# Inline image bytes allowed in one BatchAnnotateImages call, kept under Vision's request-size limit
+VISION_MAX_BATCH_BYTES = 8 * 1024 * 1024
+
+# Text in an image that commonly accompanies viral misinformation, matched in one pass
+SUSPICIOUS_TEXT_PATTERNS = [
+    'breaking news', 'urgent', 'share immediately', 'before it\'s deleted',
+    'doctors hate this', 'shocking truth', 'government hiding',
+    'click here', 'limited time', 'act now'
+]
+
+def _build_pattern_automaton(patterns: List[str]):
+    """Single-pass multi-pattern matcher; None when pyahocorasick is unavailable"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for pattern in patterns:
+        automaton.add_word(pattern, pattern)
+    automaton.make_automaton()
+    return automaton
+
+_SUSPICIOUS_TEXT_AUTOMATON = _build_pattern_automaton(SUSPICIOUS_TEXT_PATTERNS)
+
+class _ManipulationAssessment(TypedDict):
+    """Response schema for the Gemini manipulation check (JSON mode)"""
+    manipulation_likelihood: float
+    detected_issues: List[str]
+    confidence: float
+    explanation: str
+
+_JSON_DECODER = json.JSONDecoder()
+
+# Instructions for manipulation detection, set once as the Gemini system instruction
+MANIPULATION_PROMPT = """
+Analyze this image for signs of digital manipulation or editing. Look for:
+1. Inconsistent lighting or shadows
+2. Unnatural edges or blending
+3. Repeated patterns or clone stamping
+4. Color or pixel inconsistencies
+5. Compression artifacts that suggest editing
+6. Any other signs of photo manipulation
+
+Provide your analysis as a JSON response with:
+- manipulation_likelihood: score from 0-100
+- detected_issues: list of specific issues found
+- confidence: your confidence in the analysis (0-1)
+- explanation: detailed explanation
+"""
+
+# The only EXIF fields the report consults; all live in IFD0
+EXIF_FIELDS = {tag.name: tag.value for tag in (Base.Software, Base.Make, Base.Model, Base.DateTime)}
+
+# Error-level-analysis residual (std-dev after a quality-90 re-save) outside which Gemini is not consulted.
+# Only JPEG uploads are triaged: lossless formats always re-save with a large residual
+ELA_CLEAN_THRESHOLD = 1.5
+ELA_EDITED_THRESHOLD = 20.0
+ELA_DRAFT_SIZE = (512, 512)
+ELA_CONFIDENCE = 0.3  # a single global residual is a coarse heuristic, not a verdict
+
+# Images outside this pixel range (tracking pixels, decompression bombs) skip the Vision and manipulation checks
+MIN_ANALYZABLE_PIXELS = 10_000
+MAX_ANALYZABLE_PIXELS = 50_000_000
+
+# Score = 50 + weights . [has EXIF, metadata red flags, content warnings, seen on the web,
+#                        manipulation likelihood, suspicious text patterns], clipped to 0-100
+FORENSIC_SCORE_WEIGHTS = np.array([15.0, -5.0, -10.0, 10.0, -0.3, -8.0])
+
+# Report sections backed by billable Vision/Gemini calls; only these are reused for byte-identical re-uploads.
+# Per-file sections (digest, EXIF metadata, properties) and the score are always recomputed for the actual upload
+REMOTE_SECTIONS = ('content_analysis', 'text_detection', 'manipulation_detection')
+REPORT_SECTIONS = ('metadata_analysis', *REMOTE_SECTIONS, 'image_hash', 'image_properties')
+
+# Remote report sections keyed by SHA-256 digest. Perceptual near-duplicates are deliberately not shared:
+# a doctored copy of an earlier upload must get its own OCR and manipulation verdict
+_REPORT_CACHE = LRUCache(maxsize=1024)
+
+def clear_report_cache() -> None:
+    """Forget all memoized remote report sections"""
+    _REPORT_CACHE.clear()
+
+class VisionBatchQueue:
+    """
+    Coalesces annotate requests from concurrent uploads into shared BatchAnnotateImages calls
+    A batch is sent when it reaches max_batch images, when the next image would push its inline payload past
+    max_batch_bytes (Vision rejects oversized requests), or window seconds after its first request
+    """
+    
+    def __init__(self, client: Any, max_batch: int = 16, window: float = 0.1,
+                 max_batch_bytes: int = VISION_MAX_BATCH_BYTES):
+        self.client = client
+        self.max_batch = max_batch
+        self.window = window
+        self.max_batch_bytes = max_batch_bytes
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._inflight: set = set()
+    
+    async def submit(self, request: vision.AnnotateImageRequest) -> vision.AnnotateImageResponse:
+        """Queue one image request and wait for its slice of the batched response"""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._process_loop())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((request, future))
+        return await future
+    
+    @staticmethod
+    def _payload_size(request: vision.AnnotateImageRequest) -> int:
+        return len(request.image.content)
+    
+    async def _process_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        carried = None  # request that did not fit the previous batch's byte budget
+        while True:
+            first = carried if carried is not None else await self._queue.get()
+            carried = None
+            batch = [first]
+            batch_bytes = self._payload_size(first[0])
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                size = self._payload_size(item[0])
+                if batch_bytes + size > self.max_batch_bytes:
+                    carried = item
+                    break
+                batch.append(item)
+                batch_bytes += size
+            # Send without waiting so the next window can fill while this batch is in flight
+            task = asyncio.create_task(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+    
+    async def _dispatch(self, batch: List[Tuple[vision.AnnotateImageRequest, asyncio.Future]]) -> None:
+        try:
+            response = await self.client.batch_annotate_images(requests=[request for request, _ in batch])
+        except Exception as e:
+            if len(batch) > 1:
+                # One bad image must not fail its co-batched uploads: retry each on its own
+                logger.warning(f"Vision batch of {len(batch)} failed ({e}); retrying per image")
+                await asyncio.gather(*(self._dispatch([item]) for item in batch))
+                return
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, response.responses):
+            if not future.done():
+                future.set_result(result)
+
 class ImageForensics:
     """Advanced image forensics analysis for Truth Lab 2.0"""
     
@@ -24,7 +201,12 @@ class ImageForensics:
         self.config = config
         self.google_api_key = config.get('google_api_key')
         self.vision_client = None
+        self.vision_queue = None
         self.gemini_model = None
+        # Gemini calls are per-image, so concurrent uploads are only capped, not batched
+        self.gemini_slots = asyncio.Semaphore(config.get('gemini_concurrency', 4))
+        self.ela_clean_threshold = config.get('ela_clean_threshold', ELA_CLEAN_THRESHOLD)
+        self.ela_edited_threshold = config.get('ela_edited_threshold', ELA_EDITED_THRESHOLD)
         
         # Initialize Google services
         self._initialize_services()
@@ -35,15 +217,37 @@ class ImageForensics:
             if self.google_api_key:
                 # Initialize Gemini
                 genai.configure(api_key=self.google_api_key)
-                self.gemini_model = genai.GenerativeModel('gemini-1.5-flash')
+                self.gemini_model = genai.GenerativeModel(
+                    'gemini-1.5-flash',
+                    system_instruction=MANIPULATION_PROMPT,
+                    generation_config=self._json_generation_config()
+                )
                 
-                # Initialize Vision API (will use same credentials)
-                self.vision_client = vision.ImageAnnotatorClient()
+                # Initialize Vision API (will use same credentials); async gRPC keeps the event loop free
+                self.vision_client = vision.ImageAnnotatorAsyncClient()
+                self.vision_queue = VisionBatchQueue(
+                    self.vision_client,
+                    max_batch=self.config.get('vision_batch_size', 16),
+                    window=self.config.get('vision_batch_window', 0.1),
+                    max_batch_bytes=self.config.get('vision_batch_bytes', VISION_MAX_BATCH_BYTES)
+                )
                 
                 logger.info("Google services initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize Google services: {e}")
     
+    @staticmethod
+    def _json_generation_config() -> Any:
+        """Ask Gemini for schema-constrained JSON; None on SDKs without structured output"""
+        try:
+            return genai.GenerationConfig(
+                response_mime_type="application/json",
+                response_schema=_ManipulationAssessment,
+            )
+        except Exception as e:  # pragma: no cover
+            logger.warning(f"JSON output mode unavailable: {e}")
+            return None
+    
     async def analyze_image(self, image_data: bytes, filename: str = None) -> Dict[str, Any]:
         """
         Comprehensive image forensics analysis
@@ -56,53 +260,137 @@ class ImageForensics:
             Dictionary containing forensic analysis results
         """
         try:
-            analysis_start = datetime.utcnow()
-            
-            # Run all forensic analyses in parallel
-            tasks = [
-                self._extract_metadata(image_data, filename),
-                self._analyze_image_content(image_data),
-                self._detect_text_in_image(image_data),
-                self._check_image_manipulation(image_data),
-                self._generate_image_hash(image_data),
-                self._analyze_image_properties(image_data)
-            ]
-            
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            started_ns = time.perf_counter_ns()
+            timestamp = datetime.now(timezone.utc).isoformat()
+            
+            # Open once and share the image with every local helper; hashes come from a reduced decode,
+            # skipped entirely for degenerate dimensions
+            image, dhash, phash = await asyncio.to_thread(self._decode_image, image_data)
+            
+            # A single SHA-256 pass identifies both the analysis and the file
+            digest = hashlib.sha256(image_data).digest()
+            
+            # Tiny or huge images are not worth billable API calls or a full-resolution decode
+            degenerate = self._has_degenerate_dimensions(image)
+            
+            # Byte-identical re-uploads reuse the earlier Vision/Gemini sections
+            cached = _REPORT_CACHE.get(digest) if not degenerate else None
+            if cached is not None:
+                logger.info("Reusing cached Vision/Gemini report sections")
+            
+            # One Vision request serves both content analysis and text detection
+            annotation = None
+            if self.vision_client and not degenerate and cached is None:
+                annotation = asyncio.ensure_future(self._annotate_image(image_data))
+            
+            # Run all forensic analyses in parallel, keyed by report section
+            tasks = {
+                'metadata_analysis': self._extract_metadata(image, filename),
+                'image_hash': self._generate_image_hash(image_data, digest, dhash, phash),
+                'image_properties': self._analyze_image_properties(image)
+            }
+            if cached is None:
+                tasks.update({
+                    'content_analysis': self._skip_section('degenerate_dimensions') if degenerate
+                        else self._analyze_image_content(annotation),
+                    'text_detection': self._skip_section('degenerate_dimensions') if degenerate
+                        else self._detect_text_in_image(annotation),
+                    'manipulation_detection': self._skip_section('degenerate_dimensions') if degenerate
+                        else self._check_image_manipulation(image_data, image)
+                })
+            
+            sections = dict(await asyncio.gather(*(self._run_section(name, coro) for name, coro in tasks.items())))
+            if cached is not None:
+                sections.update(copy.deepcopy(cached))
+            sections = {name: sections[name] for name in REPORT_SECTIONS}
             
             # Combine results
             forensic_report = {
-                'analysis_id': hashlib.md5(image_data[:1024]).hexdigest(),
-                'timestamp': analysis_start.isoformat(),
+                'analysis_id': digest[:8].hex(),
+                'timestamp': timestamp,
                 'filename': filename,
                 'file_size': len(image_data),
-                'metadata_analysis': results[0] if not isinstance(results[0], Exception) else {'error': str(results[0])},
-                'content_analysis': results[1] if not isinstance(results[1], Exception) else {'error': str(results[1])},
-                'text_detection': results[2] if not isinstance(results[2], Exception) else {'error': str(results[2])},
-                'manipulation_detection': results[3] if not isinstance(results[3], Exception) else {'error': str(results[3])},
-                'image_hash': results[4] if not isinstance(results[4], Exception) else {'error': str(results[4])},
-                'image_properties': results[5] if not isinstance(results[5], Exception) else {'error': str(results[5])},
-                'processing_time': (datetime.utcnow() - analysis_start).total_seconds(),
-                'forensic_score': 0  # Will be calculated
+                **sections,
+                'processing_time': (time.perf_counter_ns() - started_ns) / 1e9,
+                'forensic_score': 0,  # Will be calculated
+                'cache_hit': cached is not None
             }
             
             # Calculate overall forensic score
             forensic_report['forensic_score'] = self._calculate_forensic_score(forensic_report)
             
+            # Only complete remote sections are memoized so transient API failures are retried
+            remote = {name: sections[name] for name in REMOTE_SECTIONS}
+            if cached is None and not degenerate and not any('error' in section for section in remote.values()):
+                _REPORT_CACHE[digest] = copy.deepcopy(remote)
+            
             return forensic_report
             
         except Exception as e:
             logger.error(f"Image forensics analysis failed: {e}")
             return {
                 'error': f"Analysis failed: {str(e)}",
-                'timestamp': datetime.utcnow().isoformat(),
+                'timestamp': datetime.now(timezone.utc).isoformat(),
                 'forensic_score': 0
             }
     
-    async def _extract_metadata(self, image_data: bytes, filename: str) -> Dict[str, Any]:
-        """Extract EXIF and metadata from image"""
+    @staticmethod
+    def _has_degenerate_dimensions(image: Optional[Image.Image]) -> bool:
+        """Header-only size check for inputs too small or too large to analyze meaningfully"""
+        if image is None:
+            return False
+        width, height = image.size
+        return min(width, height) <= 1 or not MIN_ANALYZABLE_PIXELS <= width * height <= MAX_ANALYZABLE_PIXELS
+    
+    @staticmethod
+    async def _skip_section(reason: str) -> Dict[str, Any]:
+        return {'skipped': reason}
+    
+    @staticmethod
+    async def _run_section(name: str, coro: Awaitable[Dict[str, Any]]) -> Tuple[str, Dict[str, Any]]:
+        """Await one report section, turning an unexpected failure into its error entry"""
+        try:
+            return name, await coro
+        except Exception as e:
+            logger.exception(f"Forensic section {name} failed")
+            return name, {'error': str(e)}
+    
+    @staticmethod
+    def _decode_image(image_data: bytes) -> Tuple[Optional[Image.Image], Optional[str], Optional[str]]:
+        """
+        Open the upload, returning the image with its difference hash and pHash
+        The shared image is only header-parsed (true size, mode, EXIF). The hashes are computed from a
+        separate draft-mode decode, which for JPEG lets libjpeg downscale by up to 8x in the DCT domain
+        (no-op for other formats). Degenerate sizes are rejected from the header alone, so a decompression
+        bomb in a format without draft support is never decoded
+        """
         try:
             image = Image.open(io.BytesIO(image_data))
+            if ImageForensics._has_degenerate_dimensions(image):
+                return image, None, None
+            thumbnail = Image.open(io.BytesIO(image_data))
+            thumbnail.draft('L', (64, 64))
+            luma = thumbnail.convert('L')
+            # Difference hash: 64 left-vs-right comparisons on a 9x8 thumbnail packed into 8 bytes
+            gray = np.asarray(luma.resize((9, 8), Image.BILINEAR), dtype=np.uint8)
+            dhash = np.packbits(gray[:, :-1] > gray[:, 1:]).tobytes().hex()
+        except Exception as e:
+            logger.warning(f"Image decoding failed: {e}")
+            return None, None, None
+        
+        phash = None
+        if cv2 is not None and hasattr(cv2, 'img_hash'):
+            try:
+                phash = cv2.img_hash.pHash(np.asarray(luma, dtype=np.uint8)).tobytes().hex()
+            except Exception as e:
+                logger.warning(f"pHash generation failed: {e}")
+        return image, dhash, phash
+    
+    async def _extract_metadata(self, image: Optional[Image.Image], filename: str) -> Dict[str, Any]:
+        """Extract EXIF and metadata from image"""
+        try:
+            if image is None:
+                return {'error': 'Image could not be decoded'}
             
             # Basic image info
             metadata = {
@@ -114,29 +402,28 @@ class ImageForensics:
                 'suspicious_indicators': []
             }
             
-            # Extract EXIF data if available
-            if hasattr(image, '_getexif'):
-                exif_data = image._getexif()
-                if exif_data:
-                    metadata['has_exif'] = True
-                    
-                    # Parse EXIF tags
-                    for tag_id, value in exif_data.items():
-                        tag = TAGS.get(tag_id, tag_id)
-                        metadata['exif_data'][tag] = str(value)
-                    
-                    # Check for suspicious indicators
-                    if 'Software' in metadata['exif_data']:
-                        software = metadata['exif_data']['Software'].lower()
-                        editing_software = ['photoshop', 'gimp', 'paint.net', 'canva', 'pixlr']
-                        if any(editor in software for editor in editing_software):
-                            metadata['suspicious_indicators'].append(f"Edited with: {software}")
-                    
-                    # Check for missing typical camera data
-                    camera_fields = ['Make', 'Model', 'DateTime']
-                    missing_fields = [field for field in camera_fields if field not in metadata['exif_data']]
-                    if len(missing_fields) == len(camera_fields):
-                        metadata['suspicious_indicators'].append("Missing camera metadata")
+            # Extract EXIF data if available; parsed straight from the APP1 payload captured at open
+            exif = image.getexif()
+            if exif:
+                metadata['has_exif'] = True
+                
+                # Materialize only the consulted tags
+                metadata['exif_data'] = {
+                    tag: str(exif[tag_id]) for tag, tag_id in EXIF_FIELDS.items() if tag_id in exif
+                }
+                
+                # Check for suspicious indicators
+                if 'Software' in metadata['exif_data']:
+                    software = metadata['exif_data']['Software'].lower()
+                    editing_software = ['photoshop', 'gimp', 'paint.net', 'canva', 'pixlr']
+                    if any(editor in software for editor in editing_software):
+                        metadata['suspicious_indicators'].append(f"Edited with: {software}")
+                
+                # Check for missing typical camera data
+                camera_fields = ['Make', 'Model', 'DateTime']
+                missing_fields = [field for field in camera_fields if field not in metadata['exif_data']]
+                if len(missing_fields) == len(camera_fields):
+                    metadata['suspicious_indicators'].append("Missing camera metadata")
             
             return metadata
             
@@ -144,37 +431,24 @@ class ImageForensics:
             logger.error(f"Metadata extraction failed: {e}")
             return {'error': f"Metadata extraction failed: {str(e)}"}
     
-    async def _analyze_image_content(self, image_data: bytes) -> Dict[str, Any]:
+    async def _annotate_image(self, image_data: bytes) -> vision.AnnotateImageResponse:
+        """Run every Vision feature for this image, sharing a BatchAnnotateImages call with concurrent uploads"""
+        request = vision.AnnotateImageRequest(
+            image=vision.Image(content=image_data),
+            features=[vision.Feature(type_=feature) for feature in VISION_FEATURES]
+        )
+        response = await self.vision_queue.submit(request)
+        if response.error.message:
+            raise RuntimeError(f"Vision API error: {response.error.message}")
+        return response
+    
+    async def _analyze_image_content(self, annotation: Optional[asyncio.Future]) -> Dict[str, Any]:
         """Analyze image content using Google Vision API"""
         try:
-            if not self.vision_client:
+            if annotation is None:
                 return {'error': 'Vision API not initialized'}
             
-            # Prepare image for Vision API
-            image = vision.Image(content=image_data)
-            
-            # Run multiple Vision API analyses
-            tasks = []
-            
-            # Object detection
-            tasks.append(self.vision_client.object_localization(image=image))
-            
-            # Label detection
-            tasks.append(self.vision_client.label_detection(image=image))
-            
-            # Face detection
-            tasks.append(self.vision_client.face_detection(image=image))
-            
-            # Logo detection
-            tasks.append(self.vision_client.logo_detection(image=image))
-            
-            # Web detection (for reverse image search)
-            tasks.append(self.vision_client.web_detection(image=image))
-            
-            # Execute all tasks
-            responses = await asyncio.gather(*[
-                asyncio.to_thread(task.result) for task in tasks
-            ], return_exceptions=True)
+            response = await annotation
             
             content_analysis = {
                 'objects': [],
@@ -187,7 +461,7 @@ class ImageForensics:
             }
             
             # Process object detection
-            if not isinstance(responses[0], Exception) and responses[0].localized_object_annotations:
+            if response.localized_object_annotations:
                 content_analysis['objects'] = [
                     {
                         'name': obj.name,
@@ -196,41 +470,41 @@ class ImageForensics:
                             'vertices': [(vertex.x, vertex.y) for vertex in obj.bounding_poly.normalized_vertices]
                         }
                     }
-                    for obj in responses[0].localized_object_annotations
+                    for obj in response.localized_object_annotations
                 ]
             
             # Process labels
-            if not isinstance(responses[1], Exception) and responses[1].label_annotations:
+            if response.label_annotations:
                 content_analysis['labels'] = [
                     {
                         'description': label.description,
                         'confidence': label.score
                     }
-                    for label in responses[1].label_annotations
+                    for label in response.label_annotations
                 ]
             
             # Process faces
-            if not isinstance(responses[2], Exception) and responses[2].face_annotations:
-                content_analysis['faces_detected'] = len(responses[2].face_annotations)
+            if response.face_annotations:
+                content_analysis['faces_detected'] = len(response.face_annotations)
                 
                 # Check for unusual face properties that might indicate manipulation
-                for face in responses[2].face_annotations:
+                for face in response.face_annotations:
                     if face.detection_confidence < 0.5:
                         content_analysis['content_warnings'].append("Low confidence face detection - possible manipulation")
             
             # Process logos
-            if not isinstance(responses[3], Exception) and responses[3].logo_annotations:
+            if response.logo_annotations:
                 content_analysis['logos'] = [
                     {
                         'description': logo.description,
                         'confidence': logo.score
                     }
-                    for logo in responses[3].logo_annotations
+                    for logo in response.logo_annotations
                 ]
             
             # Process web detection
-            if not isinstance(responses[4], Exception) and responses[4].web_detection:
-                web_detection = responses[4].web_detection
+            if response.web_detection:
+                web_detection = response.web_detection
                 
                 if web_detection.web_entities:
                     content_analysis['web_entities'] = [
@@ -253,16 +527,13 @@ class ImageForensics:
             logger.error(f"Image content analysis failed: {e}")
             return {'error': f"Content analysis failed: {str(e)}"}
     
-    async def _detect_text_in_image(self, image_data: bytes) -> Dict[str, Any]:
+    async def _detect_text_in_image(self, annotation: Optional[asyncio.Future]) -> Dict[str, Any]:
         """Detect and extract text from image"""
         try:
-            if not self.vision_client:
+            if annotation is None:
                 return {'error': 'Vision API not initialized'}
             
-            image = vision.Image(content=image_data)
-            response = await asyncio.to_thread(
-                self.vision_client.text_detection, image=image
-            )
+            response = await annotation
             
             text_analysis = {
                 'detected_text': '',
@@ -287,15 +558,13 @@ class ImageForensics:
                 
                 # Check for suspicious patterns
                 detected_text = text_analysis['detected_text'].lower()
-                suspicious_patterns = [
-                    'breaking news', 'urgent', 'share immediately', 'before it\'s deleted',
-                    'doctors hate this', 'shocking truth', 'government hiding',
-                    'click here', 'limited time', 'act now'
+                if _SUSPICIOUS_TEXT_AUTOMATON is not None:
+                    found = {pattern for _, pattern in _SUSPICIOUS_TEXT_AUTOMATON.iter(detected_text)}
+                else:
+                    found = {pattern for pattern in SUSPICIOUS_TEXT_PATTERNS if pattern in detected_text}
+                text_analysis['suspicious_text_patterns'] = [
+                    pattern for pattern in SUSPICIOUS_TEXT_PATTERNS if pattern in found
                 ]
-                
-                for pattern in suspicious_patterns:
-                    if pattern in detected_text:
-                        text_analysis['suspicious_text_patterns'].append(pattern)
             
             return text_analysis
             
@@ -303,47 +572,58 @@ class ImageForensics:
             logger.error(f"Text detection failed: {e}")
             return {'error': f"Text detection failed: {str(e)}"}
     
-    async def _check_image_manipulation(self, image_data: bytes) -> Dict[str, Any]:
+    @staticmethod
+    def _error_level_residual(image_data: bytes) -> float:
+        """
+        Mean per-band std-dev of the difference between the image and a quality-90 JPEG re-save
+        Computed on a draft decode, which libjpeg downscales in the DCT domain instead of decoding full resolution
+        """
+        draft = Image.open(io.BytesIO(image_data))
+        draft.draft('RGB', ELA_DRAFT_SIZE)
+        rgb = draft.convert('RGB')
+        buffer = io.BytesIO()
+        rgb.save(buffer, 'JPEG', quality=90)
+        recompressed = Image.open(buffer).convert('RGB')
+        stddev = ImageStat.Stat(ImageChops.difference(rgb, recompressed)).stddev
+        return sum(stddev) / len(stddev)
+    
+    async def _check_image_manipulation(self, image_data: bytes, image: Optional[Image.Image]) -> Dict[str, Any]:
         """Check for signs of image manipulation using AI analysis"""
         try:
             if not self.gemini_model:
                 return {'error': 'Gemini model not initialized'}
             
-            # Convert image to base64 for Gemini
-            image_b64 = base64.b64encode(image_data).decode()
-            
-            # Prepare prompt for manipulation detection
-            prompt = """
-            Analyze this image for signs of digital manipulation or editing. Look for:
-            1. Inconsistent lighting or shadows
-            2. Unnatural edges or blending
-            3. Repeated patterns or clone stamping
-            4. Color or pixel inconsistencies
-            5. Compression artifacts that suggest editing
-            6. Any other signs of photo manipulation
-            
-            Provide your analysis as a JSON response with:
-            - manipulation_likelihood: score from 0-100
-            - detected_issues: list of specific issues found
-            - confidence: your confidence in the analysis (0-1)
-            - explanation: detailed explanation
-            """
-            
-            # Analyze with Gemini
-            response = await asyncio.to_thread(
-                self.gemini_model.generate_content,
-                [prompt, {"mime_type": "image/jpeg", "data": image_b64}]
-            )
+            # Cheap error-level triage on JPEGs; only ambiguous images are escalated to Gemini
+            if image is not None and image.format == 'JPEG':
+                residual = await asyncio.to_thread(self._error_level_residual, image_data)
+                if residual < self.ela_clean_threshold or residual > self.ela_edited_threshold:
+                    edited = residual > self.ela_edited_threshold
+                    return {
+                        'manipulation_likelihood': 90 if edited else 5,
+                        'detected_issues': ["Inconsistent compression error levels"] if edited else [],
+                        'confidence': ELA_CONFIDENCE,
+                        'explanation': f"Heuristic error level analysis residual {residual:.2f}; not reviewed by Gemini",
+                        'method': 'ela_heuristic',
+                        'ela_residual': round(residual, 2)
+                    }
+            
+            # Gemini takes the raw bytes; the MIME type comes from the decoded format
+            mime_type = Image.MIME.get(image.format, 'image/jpeg') if image is not None else 'image/jpeg'
+            
+            # Analyze with Gemini; the instructions travel as the model's system instruction
+            async with self.gemini_slots:
+                response = await asyncio.to_thread(
+                    self.gemini_model.generate_content,
+                    [{"mime_type": mime_type, "data": image_data}]
+                )
             
             # Parse response
             try:
-                # Try to extract JSON from response
+                # JSON mode puts the object first; raw_decode stops at its closing brace
                 response_text = response.text
-                if '{' in response_text and '}' in response_text:
-                    json_start = response_text.find('{')
-                    json_end = response_text.rfind('}') + 1
-                    json_str = response_text[json_start:json_end]
-                    manipulation_analysis = json.loads(json_str)
+                json_start = response_text.find('{')
+                if json_start != -1:
+                    manipulation_analysis, _ = _JSON_DECODER.raw_decode(response_text, json_start)
                 else:
                     # Fallback if no JSON structure
                     manipulation_analysis = {
@@ -368,46 +648,21 @@ class ImageForensics:
             logger.error(f"Manipulation detection failed: {e}")
             return {'error': f"Manipulation detection failed: {str(e)}"}
     
-    async def _generate_image_hash(self, image_data: bytes) -> Dict[str, Any]:
+    async def _generate_image_hash(self, image_data: bytes, digest: bytes, dhash: Optional[str],
+                                   phash: Optional[str]) -> Dict[str, Any]:
         """Generate multiple hashes for image identification"""
-        try:
-            hashes = {
-                'md5': hashlib.md5(image_data).hexdigest(),
-                'sha256': hashlib.sha256(image_data).hexdigest(),
-                'size_bytes': len(image_data)
-            }
-            
-            # Generate perceptual hash using PIL
-            try:
-                image = Image.open(io.BytesIO(image_data))
-                # Simple perceptual hash (difference hash)
-                image = image.convert('L').resize((8, 8), Image.LANCZOS)
-                pixels = list(image.getdata())
-                
-                # Calculate difference hash
-                dhash = ""
-                for row in range(8):
-                    for col in range(7):
-                        pixel_left = pixels[row * 8 + col]
-                        pixel_right = pixels[row * 8 + col + 1]
-                        dhash += "1" if pixel_left > pixel_right else "0"
-                
-                hashes['perceptual_hash'] = dhash
-                
-            except Exception as e:
-                logger.warning(f"Perceptual hash generation failed: {e}")
-                hashes['perceptual_hash'] = None
-            
-            return hashes
-            
-        except Exception as e:
-            logger.error(f"Hash generation failed: {e}")
-            return {'error': f"Hash generation failed: {str(e)}"}
+        return {
+            'sha256': digest.hex(),
+            'size_bytes': len(image_data),
+            'perceptual_hash': dhash,
+            'phash': phash
+        }
     
-    async def _analyze_image_properties(self, image_data: bytes) -> Dict[str, Any]:
+    async def _analyze_image_properties(self, image: Optional[Image.Image]) -> Dict[str, Any]:
         """Analyze technical image properties"""
         try:
-            image = Image.open(io.BytesIO(image_data))
+            if image is None:
+                return {'error': 'Image could not be decoded'}
             
             properties = {
                 'dimensions': f"{image.size[0]}x{image.size[1]}",
@@ -439,55 +694,31 @@ class ImageForensics:
     def _calculate_forensic_score(self, forensic_report: Dict[str, Any]) -> float:
         """Calculate overall forensic credibility score"""
         try:
-            score = 50.0  # Start with neutral score
-            
-            # Metadata analysis
-            if 'metadata_analysis' in forensic_report and 'error' not in forensic_report['metadata_analysis']:
-                metadata = forensic_report['metadata_analysis']
-                
-                # Bonus for having EXIF data
-                if metadata.get('has_exif', False):
-                    score += 15
-                
-                # Penalty for suspicious indicators
-                suspicious_count = len(metadata.get('suspicious_indicators', []))
-                score -= suspicious_count * 5
-            
-            # Content analysis
-            if 'content_analysis' in forensic_report and 'error' not in forensic_report['content_analysis']:
-                content = forensic_report['content_analysis']
-                
-                # Penalty for content warnings
-                warning_count = len(content.get('content_warnings', []))
-                score -= warning_count * 10
-                
-                # Bonus for having web matches (indicates image has been seen before)
-                if content.get('similar_images'):
-                    score += 10
-            
-            # Manipulation detection
-            if 'manipulation_detection' in forensic_report and 'error' not in forensic_report['manipulation_detection']:
-                manipulation = forensic_report['manipulation_detection']
-                
-                if 'manipulation_likelihood' in manipulation:
-                    # Higher manipulation likelihood = lower score
-                    manipulation_penalty = manipulation['manipulation_likelihood'] * 0.3
-                    score -= manipulation_penalty
-            
-            # Text analysis
-            if 'text_detection' in forensic_report and 'error' not in forensic_report['text_detection']:
-                text = forensic_report['text_detection']
-                
-                # Penalty for suspicious text patterns
-                suspicious_patterns = len(text.get('suspicious_text_patterns', []))
-                score -= suspicious_patterns * 8
-            
-            # Ensure score is within bounds
-            return max(0, min(100, score))
+            return float(np.clip(50.0 + FORENSIC_SCORE_WEIGHTS @ self._score_features(forensic_report), 0, 100))
             
         except Exception as e:
             logger.error(f"Forensic score calculation failed: {e}")
             return 50.0  # Return neutral score on error
+    
+    @staticmethod
+    def _score_features(forensic_report: Dict[str, Any]) -> np.ndarray:
+        """Feature vector aligned with FORENSIC_SCORE_WEIGHTS; failed sections contribute zeros"""
+        def section(name: str) -> Dict[str, Any]:
+            result = forensic_report.get(name) or {}
+            return {} if 'error' in result else result
+        
+        metadata = section('metadata_analysis')
+        content = section('content_analysis')
+        manipulation = section('manipulation_detection')
+        text = section('text_detection')
+        return np.array([
+            bool(metadata.get('has_exif', False)),
+            len(metadata.get('suspicious_indicators', [])),
+            len(content.get('content_warnings', [])),
+            bool(content.get('similar_images')),
+            manipulation.get('manipulation_likelihood', 0),
+            len(text.get('suspicious_text_patterns', []))
+        ], dtype=np.float64)
 
 # Export the class for use in comprehensive_analysis.py
-__all__ = ['ImageForensics']
+__all__ = ['ImageForensics', 'clear_report_cache']
@@ -1,19 +1,207 @@
 # Enhanced forensic capabilities - Psychological manipulation tactics analysis
 # Part of "One-in-a-Million" features for Truth Lab 2.0
 
+import asyncio
+import copy
+import functools
+import hashlib
 import re
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+from collections import Counter
+from itertools import chain
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 from datetime import datetime
 
+from cachetools import LRUCache
+
+try:
+    import ahocorasick  # optional (pyahocorasick)
+except Exception:  # pragma: no cover
+    ahocorasick = None  # fall back to a single trie-shaped regex
+
+try:
+    import re2  # optional (google-re2)
+except Exception:  # pragma: no cover
+    re2 = None  # ASCII scans use the backtracking re engine
+
 logger = logging.getLogger(__name__)
 
+# Content longer than this is analyzed on a worker thread so the event loop keeps serving requests
+OFFLOAD_THRESHOLD = 64 * 1024
+
+# Tactics results keyed by content digest; retries and re-submitted texts skip every analyzer
+_TACTICS_CACHE = LRUCache(maxsize=512)
+
+def clear_tactics_cache() -> None:
+    """Forget all memoized tactics results"""
+    _TACTICS_CACHE.clear()
+
+# Most matches any report lists for a single pattern; further matches are only counted
+MATCH_SAMPLE_SIZE = 5
+
+# Keywords of a pure \b(?:kw1|kw2|...)\b pattern: words, spaces, hyphens and apostrophes only
+_LITERAL_KEYWORD_RE = re.compile(r"[\w' -]+")
+
+def _literal_keywords(pattern: str) -> Optional[List[str]]:
+    """Lower-cased keywords of a literal alternation pattern, or None if it needs the regex engine"""
+    if not (pattern.startswith(r'\b(?:') and pattern.endswith(r')\b')):
+        return None
+    keywords = pattern[len(r'\b(?:'):-len(r')\b')].replace("\\'", "'").split('|')
+    if not all(_LITERAL_KEYWORD_RE.fullmatch(keyword) for keyword in keywords):
+        return None
+    return [keyword.lower() for keyword in keywords]
+
+def _compile_linear(pattern: bytes):
+    """
+    Compile a bytes pattern with RE2 when installed, so scans stay linear in the input
+    (either.*or backtracks quadratically in re on long lines); falls back to re
+    """
+    if re2 is not None:
+        try:
+            return re2.compile(pattern)
+        except Exception:  # syntax RE2 does not support
+            logger.debug(f"RE2 cannot compile {pattern!r}; using re")
+    return re.compile(pattern)
+
+class _ScanPattern:
+    """
+    Regex compiled for both str and bytes text, applied to lower-cased content
+    Patterns are written in lower case, so no IGNORECASE pass is needed on top of content.lower()
+    ASCII content is scanned as bytes; on ASCII input \\b and \\w agree between the two modes,
+    so the matches are identical
+    """
+    
+    __slots__ = ('_text', '_bytes')
+    
+    def __init__(self, pattern: str):
+        self._text = re.compile(pattern)
+        self._bytes = _compile_linear(pattern.encode())
+    
+    def search(self, text):
+        return (self._bytes if isinstance(text, bytes) else self._text).search(text)
+    
+    def finditer(self, text):
+        return (self._bytes if isinstance(text, bytes) else self._text).finditer(text)
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Regex alternation of keywords factored into a trie; the longest keyword at a position wins"""
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}  # a keyword ends here
+    
+    def _render(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + _render(child) for char, child in node.items() if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+    
+    return _render(trie)
+
+class _KeywordIndex:
+    """
+    Finds every occurrence of every keyword in one pass over the text
+    Uses pyahocorasick when installed, otherwise a single trie-shaped regex
+    """
+    
+    def __init__(self, keyword_alternatives: Dict[str, List[Tuple[str, int]]]):
+        self._automaton = None
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword, alternatives in keyword_alternatives.items():
+                self._automaton.add_word(keyword, (keyword, tuple(alternatives)))
+            self._automaton.make_automaton()
+        else:
+            # A lookahead lets matches overlap; the trie reports the longest keyword at each position
+            self._regex = re.compile(f'(?=({_trie_pattern(keyword_alternatives)}))')
+            # Any shorter keyword occurring at the same position is a prefix of that longest one
+            self._prefixes = {
+                keyword: tuple(
+                    (other, tuple(alternatives))
+                    for other, alternatives in keyword_alternatives.items() if keyword.startswith(other)
+                )
+                for keyword in keyword_alternatives
+            }
+    
+    def iter(self, text: str):
+        """Yield (start, end, alternatives) for each keyword occurrence"""
+        if self._automaton is not None:
+            for last, (keyword, alternatives) in self._automaton.iter(text):
+                yield last - len(keyword) + 1, last + 1, alternatives
+            return
+        for match in self._regex.finditer(text):
+            start = match.start()
+            for keyword, alternatives in self._prefixes[match.group(1)]:
+                yield start, start + len(keyword), alternatives
+
+@functools.lru_cache(maxsize=4)
+def _build_pattern_index(patterns: Tuple[str, ...]):
+    """
+    Split patterns into one keyword index over all literal keywords and the remaining compiled regexes
+    Each keyword maps to the (pattern, alternative order) pairs it belongs to
+    Memoized per pattern set, so every analyzer instance in the process shares one index
+    """
+    keyword_alternatives: Dict[str, List[Tuple[str, int]]] = {}
+    regex_patterns = []
+    for pattern in dict.fromkeys(patterns):
+        keywords = _literal_keywords(pattern)
+        if keywords is None:
+            regex_patterns.append((pattern, _ScanPattern(pattern)))
+            continue
+        for order, keyword in enumerate(keywords):
+            keyword_alternatives.setdefault(keyword, []).append((pattern, order))
+    
+    # A keyword listed under several tables is indexed once and credits all of them per hit
+    shared = sorted(
+        keyword for keyword, alternatives in keyword_alternatives.items()
+        if len({pattern for pattern, _ in alternatives}) > 1
+    )
+    if shared:
+        logger.debug(f"Tactics keywords shared by several patterns: {', '.join(shared)}")
+    
+    keyword_index = _KeywordIndex(keyword_alternatives) if keyword_alternatives else None
+    return keyword_index, tuple(regex_patterns)
+
+def _is_word_char(char: str) -> bool:
+    """Same definition of a word character as the re module's \\w"""
+    return char.isalnum() or char == '_'
+
+def _at_word_boundary(text: str, index: int) -> bool:
+    """Whether \\b matches at index"""
+    before = index > 0 and _is_word_char(text[index - 1])
+    after = index < len(text) and _is_word_char(text[index])
+    return before != after
+
 class TacticsAnalyzer:
     """
     Advanced psychological manipulation tactics analyzer
     Enhanced forensic capability for Truth Lab 2.0
     """
     
+    # Score weight per detected match, by tactic severity
+    SEVERITY_WEIGHTS = {
+        'high': 25,
+        'medium': 15,
+        'low': 5
+    }
+    
+    # Tactic pairs whose combination earns an extra score bonus
+    HIGH_RISK_COMBINATIONS = (
+        ('emotional_manipulation', 'urgency_tactics'),
+        ('authority_undermining', 'fear_mongering'),
+        ('false_expertise', 'authority_appeal')
+    )
+    
+    # General advice added when more than three tactics are detected
+    MULTI_TACTIC_STRATEGIES = (
+        "• Multiple Tactics Detected: Use extra caution and verify with multiple sources",
+        "• Consider the motivation: Ask who benefits from you believing this information",
+        "• Take time: Don't make immediate decisions based on emotional content"
+    )
+    
     def __init__(self):
         # Comprehensive manipulation tactics database
         self.manipulation_tactics = {
@@ -201,6 +389,84 @@ class TacticsAnalyzer:
                 r'\b(?:poor|struggling|economic|recession|unemployment)\b'
             ]
         }
+        
+        # Viral design patterns
+        self.viral_patterns = {
+            'shareability': [
+                r'\b(?:share|retweet|forward|send|pass along)\b',
+                r'\b(?:tell your friends|spread the word|let others know)\b'
+            ],
+            'engagement_hooks': [
+                r'\b(?:comment below|what do you think|agree or disagree)\b',
+                r'\b(?:like if you|share if you agree|retweet if)\b'
+            ],
+            'controversy': [
+                r'\b(?:controversial|shocking|banned|censored|forbidden)\b',
+                r'\b(?:they don\'t want|hidden truth|secret information)\b'
+            ],
+            'urgency_spread': [
+                r'\b(?:before it\'s deleted|share quickly|going viral)\b',
+                r'\b(?:limited time|disappearing soon|act fast)\b'
+            ]
+        }
+        
+        # Emotional states targeted for manipulation
+        self.emotional_states = {
+            'anger': r'\b(?:angry|furious|outraged|mad|pissed)\b',
+            'fear': r'\b(?:scared|afraid|worried|anxious|terrified)\b',
+            'sadness': r'\b(?:sad|depressed|hopeless|devastated|heartbroken)\b',
+            'greed': r'\b(?:money|profit|wealth|rich|financial gain)\b'
+        }
+        
+        # Decision-making interference, as one alternation so a single lookup answers the check
+        self.decision_interference = (
+            r'\b(?:don\'t think|just believe|trust blindly|follow orders'
+            r'|no time to research|obvious choice|simple decision)\b'
+        )
+        
+        # Platform-specific spread indicators
+        self.platform_indicators = {
+            'social_media': r'\b(?:#\w+|@\w+|hashtag|trending|viral)\b',
+            'messaging_apps': r'\b(?:forward|broadcast|group chat|family group)\b',
+            'email_chains': r'\b(?:forward this|send to everyone|email your friends)\b'
+        }
+        
+        # Keyword patterns are matched in a single pass over the text; anything else stays a regex
+        self._keyword_index, self._regex_patterns = _build_pattern_index(tuple(chain(
+            chain.from_iterable(tactic_info['patterns'] for tactic_info in self.manipulation_tactics.values()),
+            *self.vulnerability_patterns.values(),
+            *self.audience_patterns.values(),
+            *self.viral_patterns.values(),
+            self.emotional_states.values(),
+            (self.decision_interference,),
+            self.platform_indicators.values()
+        )))
+        
+        # Display labels for every table key that appears in a report line
+        self._labels = {
+            key: key.replace('_', ' ').title()
+            for key in chain(self.manipulation_tactics, self.audience_patterns,
+                             self.viral_patterns, self.platform_indicators)
+        }
+        
+        # Parallel per-tactic arrays, indexed alike, for the detection and scoring loops
+        self._tactic_names = tuple(self.manipulation_tactics)
+        self._tactic_patterns = tuple(
+            tuple(tactic_info['patterns']) for tactic_info in self.manipulation_tactics.values()
+        )
+        self._tactic_weights = tuple(
+            self.SEVERITY_WEIGHTS.get(tactic_info['severity'], 5) for tactic_info in self.manipulation_tactics.values()
+        )
+        
+        # Bit i stands for tactic i, so severity and combination checks are integer mask tests
+        tactic_bits = {tactic_name: 1 << index for index, tactic_name in enumerate(self._tactic_names)}
+        self._high_severity_mask = sum(
+            tactic_bits[tactic_name] for tactic_name, tactic_info in self.manipulation_tactics.items()
+            if tactic_info['severity'] == 'high'
+        )
+        self._combination_masks = tuple(
+            tactic_bits[first] | tactic_bits[second] for first, second in self.HIGH_RISK_COMBINATIONS
+        )
     
     async def analyze_manipulation_tactics(self, content: str) -> Dict[str, Any]:
         """
@@ -208,36 +474,18 @@ class TacticsAnalyzer:
         Enhanced with psychological profiling and spread analysis
         """
         try:
-            content_lower = content.lower()
-            
-            # Detect manipulation tactics
-            detected_tactics = await self._detect_tactics(content_lower)
-            
-            # Analyze psychological targeting
-            psychological_analysis = await self._analyze_psychological_targeting(content_lower)
-            
-            # Identify target audience
-            target_analysis = await self._analyze_target_audience(content_lower)
+            cache_key = hashlib.blake2b(content.encode(), digest_size=16).digest()
+            cached = _TACTICS_CACHE.get(cache_key)
+            if cached is not None:
+                return copy.deepcopy(cached)
             
-            # Analyze spread mechanisms
-            spread_analysis = await self._analyze_spread_mechanisms(content_lower)
-            
-            # Generate overall manipulation score
-            manipulation_score = await self._calculate_manipulation_score(detected_tactics)
-            
-            # Provide counter-strategies
-            counter_strategies = await self._generate_counter_strategies(detected_tactics)
-            
-            return {
-                'psychological_analysis': psychological_analysis,
-                'advanced_tactics': list(detected_tactics.keys()),
-                'spread_analysis': spread_analysis,
-                'target_audience': target_analysis,
-                'manipulation_score': manipulation_score,
-                'detected_tactics_detailed': detected_tactics,
-                'counter_strategies': counter_strategies,
-                'risk_assessment': await self._assess_manipulation_risk(detected_tactics, manipulation_score)
-            }
+            # Pure CPU work: inline for typical posts, on a worker thread for large articles
+            if len(content) > OFFLOAD_THRESHOLD:
+                result = await asyncio.to_thread(self._analyze, content)
+            else:
+                result = self._analyze(content)
+            _TACTICS_CACHE[cache_key] = copy.deepcopy(result)
+            return result
             
         except Exception as e:
             logger.error(f"Tactics analysis failed: {str(e)}")
@@ -252,23 +500,111 @@ class TacticsAnalyzer:
                 'risk_assessment': "Unable to assess"
             }
     
-    async def _detect_tactics(self, content_lower: str) -> Dict[str, Dict[str, Any]]:
-        """Detect specific manipulation tactics in content"""
+    def _analyze(self, content: str) -> Dict[str, Any]:
+        """Run every tactics analyzer over the content"""
+        content_lower = content.lower()
+        pattern_hits = self._scan_patterns(content_lower)
+        
+        # Detect manipulation tactics
+        detected_tactics, tactic_counts = self._detect_tactics(pattern_hits)
+        severity_counts = Counter(tactic_data['severity'] for tactic_data in detected_tactics.values())
+        
+        # Analyze psychological targeting
+        psychological_analysis = self._analyze_psychological_targeting(pattern_hits)
+        
+        # Identify target audience
+        target_analysis = self._analyze_target_audience(pattern_hits)
+        
+        # Analyze spread mechanisms
+        spread_analysis = self._analyze_spread_mechanisms(pattern_hits)
+        
+        # Generate overall manipulation score
+        manipulation_score = self._calculate_manipulation_score(tactic_counts)
+        
+        # Provide counter-strategies
+        counter_strategies = self._generate_counter_strategies(detected_tactics, severity_counts)
+        
+        return {
+            'psychological_analysis': psychological_analysis,
+            'advanced_tactics': list(detected_tactics.keys()),
+            'spread_analysis': spread_analysis,
+            'target_audience': target_analysis,
+            'manipulation_score': manipulation_score,
+            'detected_tactics_detailed': detected_tactics,
+            'counter_strategies': counter_strategies,
+            'risk_assessment': self._assess_manipulation_risk(detected_tactics, severity_counts, manipulation_score)
+        }
+    
+    def _scan_patterns(self, content_lower: str) -> Dict[str, Tuple[int, List[str]]]:
+        """
+        Find the matches of every pattern the analyzers consult
+        Returns pattern -> (match count, first matches in re.findall order), for patterns that matched
+        """
+        pattern_hits = {}
+        
+        if self._keyword_index is not None:
+            # pattern -> start -> (alternative order, end) of the keyword a regex would pick there
+            candidates: Dict[str, Dict[int, Tuple[int, int]]] = {}
+            for start, end, alternatives in self._keyword_index.iter(content_lower):
+                if not (_at_word_boundary(content_lower, start) and _at_word_boundary(content_lower, end)):
+                    continue
+                for pattern, order in alternatives:
+                    starts = candidates.setdefault(pattern, {})
+                    if start not in starts or order < starts[start][0]:
+                        starts[start] = (order, end)
+            
+            # Replay findall: leftmost match first, first listed alternative wins, no overlaps
+            for pattern, starts in candidates.items():
+                count = 0
+                sample = []
+                resume = 0
+                for start in sorted(starts):
+                    if start >= resume:
+                        count += 1
+                        if len(sample) < MATCH_SAMPLE_SIZE:
+                            sample.append(content_lower[start:starts[start][1]])
+                        resume = starts[start][1]
+                pattern_hits[pattern] = (count, sample)
+        
+        # Count every match but only keep the few that are displayed. Regexes scan ASCII text
+        # as bytes; offsets are the same in both forms
+        scan_text = content_lower.encode('ascii') if content_lower.isascii() else content_lower
+        for pattern, regex in self._regex_patterns:
+            count = 0
+            sample = []
+            for match in regex.finditer(scan_text):
+                count += 1
+                if len(sample) < MATCH_SAMPLE_SIZE:
+                    sample.append(content_lower[match.start():match.end()])
+            if count:
+                pattern_hits[pattern] = (count, sample)
+        
+        return pattern_hits
+    
+    def _detect_tactics(self, pattern_hits: Dict[str, Tuple[int, List[str]]]
+                        ) -> Tuple[Dict[str, Dict[str, Any]], List[int]]:
+        """
+        Detect specific manipulation tactics in content
+        Returns the detected tactics and the match count of every tactic, in _tactic_names order
+        """
         detected_tactics = {}
+        tactic_counts = []
         
-        for tactic_name, tactic_info in self.manipulation_tactics.items():
+        for tactic_name, patterns in zip(self._tactic_names, self._tactic_patterns):
             matches = []
             match_count = 0
             
-            for pattern in tactic_info['patterns']:
-                pattern_matches = re.findall(pattern, content_lower, re.IGNORECASE)
-                if pattern_matches:
-                    matches.extend(pattern_matches)
-                    match_count += len(pattern_matches)
+            for pattern in patterns:
+                if pattern in pattern_hits:
+                    count, sample = pattern_hits[pattern]
+                    matches.extend(sample[:MATCH_SAMPLE_SIZE - len(matches)])  # Limit displayed matches
+                    match_count += count
             
+            tactic_counts.append(match_count)
             if match_count > 0:
+                tactic_info = self.manipulation_tactics[tactic_name]
                 detected_tactics[tactic_name] = {
-                    'matches': matches[:5],  # Limit displayed matches
+                    'matches': matches,
                     'count': match_count,
                     'description': tactic_info['description'],
                     'psychological_effect': tactic_info['psychological_effect'],
@@ -276,128 +612,75 @@ class TacticsAnalyzer:
                     'counter_strategy': tactic_info['counter_strategy']
                 }
         
-        return detected_tactics
+        return detected_tactics, tactic_counts
     
-    async def _analyze_psychological_targeting(self, content_lower: str) -> str:
+    def _analyze_psychological_targeting(self, pattern_hits: Dict[str, Tuple[int, List[str]]]) -> str:
         """Analyze psychological vulnerabilities being targeted"""
         targeting_analysis = []
         
         # Check for confirmation bias targeting
-        for pattern in self.vulnerability_patterns['confirmation_bias']:
-            if re.search(pattern, content_lower, re.IGNORECASE):
-                targeting_analysis.append("• Confirmation Bias: Reinforces existing beliefs")
-                break
+        if any(pattern in pattern_hits for pattern in self.vulnerability_patterns['confirmation_bias']):
+            targeting_analysis.append("• Confirmation Bias: Reinforces existing beliefs")
         
         # Check for social proof manipulation
-        for pattern in self.vulnerability_patterns['social_proof']:
-            if re.search(pattern, content_lower, re.IGNORECASE):
-                targeting_analysis.append("• Social Proof: Uses perceived popularity as validation")
-                break
+        if any(pattern in pattern_hits for pattern in self.vulnerability_patterns['social_proof']):
+            targeting_analysis.append("• Social Proof: Uses perceived popularity as validation")
         
         # Check for cognitive dissonance exploitation
-        for pattern in self.vulnerability_patterns['cognitive_dissonance']:
-            if re.search(pattern, content_lower, re.IGNORECASE):
-                targeting_analysis.append("• Cognitive Dissonance: Encourages ignoring contradictory evidence")
-                break
+        if any(pattern in pattern_hits for pattern in self.vulnerability_patterns['cognitive_dissonance']):
+            targeting_analysis.append("• Cognitive Dissonance: Encourages ignoring contradictory evidence")
         
         # Analyze emotional state targeting
-        emotional_states = {
-            'anger': [r'\b(?:angry|furious|outraged|mad|pissed)\b', 'anger'],
-            'fear': [r'\b(?:scared|afraid|worried|anxious|terrified)\b', 'fear'],
-            'sadness': [r'\b(?:sad|depressed|hopeless|devastated|heartbroken)\b', 'sadness'],
-            'greed': [r'\b(?:money|profit|wealth|rich|financial gain)\b', 'greed']
-        }
-        
-        for emotion, (pattern, name) in emotional_states.items():
-            if re.search(pattern, content_lower, re.IGNORECASE):
-                targeting_analysis.append(f"• Emotional State: Targets {name} for manipulation")
+        for emotion, pattern in self.emotional_states.items():
+            if pattern in pattern_hits:
+                targeting_analysis.append(f"• Emotional State: Targets {emotion} for manipulation")
         
         # Analyze decision-making interference
-        decision_interference = [
-            r'\b(?:don\'t think|just believe|trust blindly|follow orders)\b',
-            r'\b(?:no time to research|obvious choice|simple decision)\b'
-        ]
-        
-        for pattern in decision_interference:
-            if re.search(pattern, content_lower, re.IGNORECASE):
-                targeting_analysis.append("• Decision Interference: Discourages critical thinking")
-                break
+        if self.decision_interference in pattern_hits:
+            targeting_analysis.append("• Decision Interference: Discourages critical thinking")
         
         if not targeting_analysis:
             targeting_analysis.append("• No specific psychological targeting detected")
         
         return "\n".join(targeting_analysis)
     
-    async def _analyze_target_audience(self, content_lower: str) -> str:
+    def _analyze_target_audience(self, pattern_hits: Dict[str, Tuple[int, List[str]]]) -> str:
         """Identify likely target audience based on content patterns"""
-        target_scores = {}
-        
+        # Per-audience counters straight from the shared scan
+        target_scores = Counter()
         for audience, patterns in self.audience_patterns.items():
-            score = 0
             for pattern in patterns:
-                matches = len(re.findall(pattern, content_lower, re.IGNORECASE))
-                score += matches
-            
-            if score > 0:
-                target_scores[audience] = score
+                if pattern in pattern_hits:
+                    target_scores[audience] += pattern_hits[pattern][0]
         
         if not target_scores:
             return "General audience - no specific targeting detected"
         
-        # Sort by score and return top targets
-        sorted_targets = sorted(target_scores.items(), key=lambda x: x[1], reverse=True)
-        
         target_analysis = []
-        for audience, score in sorted_targets[:3]:  # Top 3 targets
-            readable_audience = audience.replace('_', ' ').title()
+        for audience, score in target_scores.most_common(3):  # Top 3 targets
+            readable_audience = self._labels[audience]
             target_analysis.append(f"• {readable_audience}: {score} targeting indicators")
         
         return "\n".join(target_analysis)
     
-    async def _analyze_spread_mechanisms(self, content_lower: str) -> str:
+    def _analyze_spread_mechanisms(self, pattern_hits: Dict[str, Tuple[int, List[str]]]) -> str:
         """Analyze how content is designed to spread"""
         spread_mechanisms = []
         
-        # Viral design patterns
-        viral_patterns = {
-            'shareability': [
-                r'\b(?:share|retweet|forward|send|pass along)\b',
-                r'\b(?:tell your friends|spread the word|let others know)\b'
-            ],
-            'engagement_hooks': [
-                r'\b(?:comment below|what do you think|agree or disagree)\b',
-                r'\b(?:like if you|share if you agree|retweet if)\b'
-            ],
-            'controversy': [
-                r'\b(?:controversial|shocking|banned|censored|forbidden)\b',
-                r'\b(?:they don\'t want|hidden truth|secret information)\b'
-            ],
-            'urgency_spread': [
-                r'\b(?:before it\'s deleted|share quickly|going viral)\b',
-                r'\b(?:limited time|disappearing soon|act fast)\b'
-            ]
-        }
-        
-        for mechanism, patterns in viral_patterns.items():
+        for mechanism, patterns in self.viral_patterns.items():
             found_patterns = []
             for pattern in patterns:
-                matches = re.findall(pattern, content_lower, re.IGNORECASE)
-                found_patterns.extend(matches)
+                if pattern in pattern_hits:
+                    found_patterns.extend(pattern_hits[pattern][1][:3 - len(found_patterns)])  # First 3 shown
             
             if found_patterns:
-                readable_mechanism = mechanism.replace('_', ' ').title()
-                spread_mechanisms.append(f"• {readable_mechanism}: {', '.join(found_patterns[:3])}")
+                readable_mechanism = self._labels[mechanism]
+                spread_mechanisms.append(f"• {readable_mechanism}: {', '.join(found_patterns)}")
         
         # Platform-specific spread indicators
-        platform_indicators = {
-            'social_media': r'\b(?:#\w+|@\w+|hashtag|trending|viral)\b',
-            'messaging_apps': r'\b(?:forward|broadcast|group chat|family group)\b',
-            'email_chains': r'\b(?:forward this|send to everyone|email your friends)\b'
-        }
-        
-        for platform, pattern in platform_indicators.items():
-            if re.search(pattern, content_lower, re.IGNORECASE):
-                readable_platform = platform.replace('_', ' ').title()
+        for platform, pattern in self.platform_indicators.items():
+            if pattern in pattern_hits:
+                readable_platform = self._labels[platform]
                 spread_mechanisms.append(f"• {readable_platform}: Optimized for platform sharing")
         
         if not spread_mechanisms:
@@ -405,47 +688,27 @@ class TacticsAnalyzer:
         
         return "\n".join(spread_mechanisms)
     
-    async def _calculate_manipulation_score(self, detected_tactics: Dict[str, Dict[str, Any]]) -> int:
-        """Calculate overall manipulation score based on detected tactics"""
-        total_score = 0
-        
-        # Severity weights
-        severity_weights = {
-            'high': 25,
-            'medium': 15,
-            'low': 5
-        }
-        
-        for tactic_name, tactic_data in detected_tactics.items():
-            severity = tactic_data.get('severity', 'low')
-            count = tactic_data.get('count', 0)
-            weight = severity_weights.get(severity, 5)
-            
-            # Score = base weight * count * multiplier
-            tactic_score = weight * count * 1.5
-            total_score += tactic_score
+    def _calculate_manipulation_score(self, tactic_counts: List[int]) -> int:
+        """Calculate overall manipulation score from the per-tactic match counts"""
+        # Score = base weight * count * multiplier, summed over tactics
+        total_score = sum(weight * count for weight, count in zip(self._tactic_weights, tactic_counts)) * 1.5
         
         # Additional scoring factors
+        present = sum(1 << index for index, count in enumerate(tactic_counts) if count)
         
         # Multiple high-severity tactics (compound effect)
-        high_severity_tactics = [t for t in detected_tactics.values() if t.get('severity') == 'high']
-        if len(high_severity_tactics) > 2:
+        if (present & self._high_severity_mask).bit_count() > 2:
             total_score += 30  # Bonus for multiple high-severity tactics
         
         # Specific high-risk combinations
-        high_risk_combinations = [
-            ('emotional_manipulation', 'urgency_tactics'),
-            ('authority_undermining', 'fear_mongering'),
-            ('false_expertise', 'authority_appeal')
-        ]
-        
-        for combo in high_risk_combinations:
-            if combo[0] in detected_tactics and combo[1] in detected_tactics:
+        for mask in self._combination_masks:
+            if present & mask == mask:
                 total_score += 25  # Bonus for dangerous combinations
         
         return min(100, int(total_score))  # Cap at 100
     
-    async def _generate_counter_strategies(self, detected_tactics: Dict[str, Dict[str, Any]]) -> List[str]:
+    def _generate_counter_strategies(self, detected_tactics: Dict[str, Dict[str, Any]],
+                                     severity_counts: Counter) -> List[str]:
         """Generate specific counter-strategies for detected tactics"""
         strategies = []
         
@@ -453,25 +716,21 @@ class TacticsAnalyzer:
         for tactic_name, tactic_data in detected_tactics.items():
             counter_strategy = tactic_data.get('counter_strategy')
             if counter_strategy:
-                tactic_readable = tactic_name.replace('_', ' ').title()
+                tactic_readable = self._labels[tactic_name]
                 strategies.append(f"• {tactic_readable}: {counter_strategy}")
         
         # Add general strategies if multiple tactics detected
         if len(detected_tactics) > 3:
-            strategies.extend([
-                "• Multiple Tactics Detected: Use extra caution and verify with multiple sources",
-                "• Consider the motivation: Ask who benefits from you believing this information",
-                "• Take time: Don't make immediate decisions based on emotional content"
-            ])
+            strategies.extend(self.MULTI_TACTIC_STRATEGIES)
         
         # Add educational resources
-        if any(severity == 'high' for tactic_data in detected_tactics.values() 
-               if tactic_data.get('severity') == 'high'):
+        if severity_counts['high']:
             strategies.append("• Learn more about manipulation tactics to build resistance")
         
         return strategies if strategies else ["• No specific counter-strategies needed"]
     
-    async def _assess_manipulation_risk(self, detected_tactics: Dict[str, Dict[str, Any]], manipulation_score: int) -> str:
+    def _assess_manipulation_risk(self, detected_tactics: Dict[str, Dict[str, Any]], severity_counts: Counter,
+                                  manipulation_score: int) -> str:
         """Assess overall risk level and provide summary"""
         risk_factors = []
         
@@ -490,7 +749,7 @@ class TacticsAnalyzer:
             risk_factors.append("Low manipulation score")
         
         # Specific risk factors
-        high_severity_count = len([t for t in detected_tactics.values() if t.get('severity') == 'high'])
+        high_severity_count = severity_counts['high']
         if high_severity_count > 0:
             risk_factors.append(f"{high_severity_count} high-severity tactics detected")
         
@@ -505,8 +764,8 @@ class TacticsAnalyzer:
         if 'authority_undermining' in detected_tactics:
             risk_factors.append("Attempts to undermine credible authorities")
         
-        summary = f"Risk Level: {risk_level}\n"
-        summary += f"Manipulation Score: {manipulation_score}/100\n"
-        summary += f"Risk Factors: {', '.join(risk_factors) if risk_factors else 'None identified'}"
-        
-        return summary
\ No newline at end of file
+        return (
+            f"Risk Level: {risk_level}\n"
+            f"Manipulation Score: {manipulation_score}/100\n"
+            f"Risk Factors: {', '.join(risk_factors) if risk_factors else 'None identified'}"
+        )
\ No newline at end of file
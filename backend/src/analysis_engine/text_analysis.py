@@ -1,51 +1,165 @@
 # Migrated from: TruthLens/utils/ai_services.py - GeminiService and FactCheckService classes
 import asyncio
 import aiohttp
+import copy
+import hashlib
 import logging
-from typing import Dict, List, Any, Optional
+import orjson
+import re
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict, List, Any, Mapping, Optional, Tuple
+
+from cachetools import TTLCache
 
 from ..utils.config import Config
 
 logger = logging.getLogger(__name__)
 
-class TextAnalyzer:
+# Process-wide HTTP session so Gemini and Fact Check calls reuse pooled keep-alive connections
+_HTTP_SESSION: Optional[aiohttp.ClientSession] = None
+
+def _orjson_dumps(obj: Any) -> str:
+    """orjson encoder for aiohttp request bodies"""
+    return orjson.dumps(obj).decode()
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Shared HTTP session with a pooled, DNS-caching connector, created on first use"""
+    global _HTTP_SESSION
+    if _HTTP_SESSION is None or _HTTP_SESSION.closed:
+        _HTTP_SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=20,
+                ttl_dns_cache=300,
+                keepalive_timeout=30
+            ),
+            timeout=aiohttp.ClientTimeout(total=30),
+            json_serialize=_orjson_dumps
+        )
+    return _HTTP_SESSION
+
+async def close_http_session() -> None:
+    """Release the shared HTTP session"""
+    global _HTTP_SESSION
+    if _HTTP_SESSION is not None and not _HTTP_SESSION.closed:
+        await _HTTP_SESSION.close()
+    _HTTP_SESSION = None
+
+# Emoji prefixes that open the next section of a Gemini response
+_SECTION_TERMINATORS = ('🔍', '🧬', '📊', '🎯', '⚠️', '🛡️', '📋')
+_SECTION_END_RE = re.compile("^(?:" + "|".join(map(re.escape, _SECTION_TERMINATORS)) + ")", re.M)
+
+# "- label: rest" list items in a response section, captured as (label, rest)
+_LIST_ITEM_RE = re.compile(r"^[^\S\n]*-([^:\n]*):(.*)$", re.M)
+
+class GeminiLimiter:
     """
-    Advanced text analysis using Gemini AI and fact-checking APIs
-    Migrated from: TruthLens/utils/ai_services.py - GeminiService class
-    Enhanced with async capabilities and improved error handling
+    Client-side throttle for Gemini calls
+    A sliding-window RPM cap plus AIMD concurrency: the in-flight limit grows by one while
+    latency stays under target and is cut multiplicatively on slow responses, 429s and 5xx,
+    honouring retry-after and x-ratelimit-* headers when the API sends them
     """
     
-    def __init__(self):
-        self.config = Config()
-        self.gemini_api_key = self.config.GEMINI_API_KEY
-        self.google_api_key = self.config.GOOGLE_API_KEY
-        self.base_url = "https://generativelanguage.googleapis.com/v1beta/models"
-        self.fact_check_url = "https://factchecktools.googleapis.com/v1alpha1"
-        
-    async def test_connection(self) -> bool:
-        """Test Gemini AI connection"""
-        try:
-            response = await self._make_gemini_request("Hello", model="gemini-1.5-flash")
-            return response is not None
-        except:
-            return False
+    WINDOW = 60.0              # seconds covered by the RPM counter
+    INCREASE = 1.0             # additive step while healthy
+    DECREASE = 0.5             # multiplicative cut on overload
+    LOW_REMAINING_RATIO = 0.1  # pause once less than this share of the quota remains
     
-    async def test_fact_check_connection(self) -> bool:
-        """Test fact check API connection"""
-        try:
-            result = await self.search_fact_checks("test")
-            return True
-        except:
-            return False
+    def __init__(self, rpm: int, min_concurrency: int, max_concurrency: int, latency_target: float):
+        self.rpm = max(1, rpm)
+        self.min_concurrency = max(1, min_concurrency)
+        self.max_concurrency = max(self.min_concurrency, max_concurrency)
+        self.latency_target = latency_target
+        self.concurrency = float(self.max_concurrency)
+        self._in_flight = 0
+        self._started = deque()
+        self._latencies = deque(maxlen=20)
+        self._paused_until = 0.0
+        self._slot_freed = asyncio.Event()
     
-    async def forensic_analysis(self, text: str, language: str = "en") -> Dict[str, Any]:
-        """
-        Specialized forensic analysis using Gemini AI
-        Migrated from: TruthLens/utils/ai_services.py - forensic_analysis()
-        Enhanced with structured response parsing
-        """
+    async def acquire(self) -> None:
+        """Wait for a concurrency slot, the end of any pause, and room in the RPM window"""
+        while True:
+            now = time.monotonic()
+            while self._started and now - self._started[0] >= self.WINDOW:
+                self._started.popleft()
+            
+            if self._paused_until > now:
+                delay = self._paused_until - now
+            elif len(self._started) >= self.rpm:
+                delay = self._started[0] + self.WINDOW - now
+            elif self._in_flight >= int(self.concurrency):
+                delay = None
+            else:
+                self._in_flight += 1
+                self._started.append(now)
+                return
+            
+            self._slot_freed.clear()
+            try:
+                await asyncio.wait_for(self._slot_freed.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+    
+    def release(self) -> None:
+        """Free the slot taken by acquire() and wake waiting callers"""
+        self._in_flight -= 1
+        self._slot_freed.set()
+    
+    def record(self, status: Optional[int], latency: float, headers: Optional[Mapping[str, str]] = None) -> None:
+        """Feed one response (status None for a transport failure) back into the controller"""
+        headers = headers or {}
+        now = time.monotonic()
+        
+        if status == 429 or status is None or status >= 500:
+            self.concurrency = max(self.min_concurrency, self.concurrency * self.DECREASE)
+            if status == 429:
+                retry_after = _header_seconds(headers.get('retry-after')) or 1.0
+                self._paused_until = max(self._paused_until, now + retry_after)
+                logger.warning(f"Gemini rate limited; pausing {retry_after:.1f}s, concurrency {int(self.concurrency)}")
+        else:
+            self._latencies.append(latency)
+            if sum(self._latencies) / len(self._latencies) <= self.latency_target:
+                self.concurrency = min(self.max_concurrency, self.concurrency + self.INCREASE)
+            else:
+                self.concurrency = max(self.min_concurrency, self.concurrency * self.DECREASE)
         
-        prompt = f"""
+        remaining = _header_seconds(headers.get('x-ratelimit-remaining-requests'))
+        limit = _header_seconds(headers.get('x-ratelimit-limit-requests'))
+        if remaining is not None and limit and remaining < limit * self.LOW_REMAINING_RATIO:
+            reset = _header_seconds(headers.get('x-ratelimit-reset-requests')) or 1.0
+            self._paused_until = max(self._paused_until, now + reset)
+
+def _header_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse a numeric rate-limit header such as "12", "1.5" or "20s"; None if absent or malformed"""
+    if not value:
+        return None
+    try:
+        return float(value.strip().rstrip('s'))
+    except ValueError:
+        return None
+
+_GEMINI_LIMITER = GeminiLimiter(
+    rpm=Config.GEMINI_RPM_LIMIT,
+    min_concurrency=Config.GEMINI_MIN_CONCURRENCY,
+    max_concurrency=Config.GEMINI_MAX_CONCURRENCY,
+    latency_target=Config.GEMINI_LATENCY_TARGET
+)
+
+# Gemini responses keyed by (model, prompt) digest; viral claims are submitted many times over
+_GEMINI_CACHE = TTLCache(maxsize=2048, ttl=3600)
+
+# Parsed Fact Check results keyed by the truncated query digest
+_FACT_CHECK_CACHE = TTLCache(maxsize=2048, ttl=3600)
+
+def clear_text_cache() -> None:
+    """Forget all memoized Gemini responses and fact check results"""
+    _GEMINI_CACHE.clear()
+    _FACT_CHECK_CACHE.clear()
+
+# Forensic analysis prompt; text and language are filled in per request
+_FORENSIC_PROMPT = """
         As a digital forensics expert, analyze this content for misinformation:
         
         CONTENT: "{text}"
@@ -96,6 +210,86 @@ class TextAnalyzer:
         Language: {language}
         Be specific, cite sources with links, use emojis for readability.
         """
+
+# Origin tracing prompt; text is filled in per request
+_ORIGIN_PROMPT = """
+        As a digital investigator, analyze the potential origins of this content:
+        
+        CONTENT: "{text}"
+        
+        Analyze:
+        🕵️ LINGUISTIC PATTERNS: [Writing style, grammar, vocabulary clues]
+        📅 TEMPORAL CLUES: [References to dates, events, timing]
+        🌍 GEOGRAPHIC INDICATORS: [Location references, cultural context]
+        📱 PLATFORM INDICATORS: [Formatting, hashtags, platform-specific language]
+        🔄 PROPAGATION PATTERN: [How this might spread, typical vectors]
+        
+        Provide your best assessment of where/when this originated.
+        """
+
+# Missing-context prompt; text is filled in per request
+_CONTEXT_PROMPT = """
+        As a context analyst, identify what crucial context is missing from this content:
+        
+        CONTENT: "{text}"
+        
+        Identify:
+        📚 MISSING BACKGROUND: [What background info is needed?]
+        📊 MISSING DATA: [What statistics or data are omitted?]
+        ⏰ MISSING TIMELINE: [What timeline context is missing?]
+        🔗 MISSING CONNECTIONS: [What related events/facts aren't mentioned?]
+        📝 CHERRY-PICKING: [What contradictory evidence might exist?]
+        
+        Explain why this missing context matters for understanding the truth.
+        """
+
+class TextAnalyzer:
+    """
+    Advanced text analysis using Gemini AI and fact-checking APIs
+    Migrated from: TruthLens/utils/ai_services.py - GeminiService class
+    Enhanced with async capabilities and improved error handling
+    """
+    
+    def __init__(self, session: Optional[aiohttp.ClientSession] = None):
+        self.config = Config()
+        self._session = session
+        self._inflight: Dict[Tuple[str, bytes], asyncio.Task] = {}
+        self.gemini_api_key = self.config.GEMINI_API_KEY
+        self.google_api_key = self.config.GOOGLE_API_KEY
+        self.base_url = "https://generativelanguage.googleapis.com/v1beta/models"
+        self.fact_check_url = "https://factchecktools.googleapis.com/v1alpha1"
+    
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Injected HTTP session, falling back to the process-wide one"""
+        if self._session is not None and not self._session.closed:
+            return self._session
+        return get_http_session()
+        
+    async def test_connection(self) -> bool:
+        """Test Gemini AI connection"""
+        try:
+            response = await self._post_gemini("Hello", model="gemini-1.5-flash")
+            return response is not None
+        except:
+            return False
+    
+    async def test_fact_check_connection(self) -> bool:
+        """Test fact check API connection"""
+        try:
+            result = await self._fetch_fact_checks("test")
+            return True
+        except:
+            return False
+    
+    async def forensic_analysis(self, text: str, language: str = "en") -> Dict[str, Any]:
+        """
+        Specialized forensic analysis using Gemini AI
+        Migrated from: TruthLens/utils/ai_services.py - forensic_analysis()
+        Enhanced with structured response parsing
+        """
+        
+        prompt = _FORENSIC_PROMPT.format(text=text, language=language)
         
         try:
             ai_response = await self._make_gemini_request(prompt, model="gemini-1.5-pro")
@@ -113,7 +307,8 @@ class TextAnalyzer:
                 return {
                     'analysis': "AI analysis temporarily unavailable",
                     'sources': [],
-                    'reporting_emails': []
+                    'reporting_emails': [],
+                    'fallback': True
                 }
                 
         except Exception as e:
@@ -121,7 +316,8 @@ class TextAnalyzer:
             return {
                 'analysis': f"AI analysis error: {str(e)}",
                 'sources': [],
-                'reporting_emails': []
+                'reporting_emails': [],
+                'fallback': True
             }
     
     async def trace_origin(self, text: str) -> str:
@@ -129,20 +325,7 @@ class TextAnalyzer:
         Trace content origins
         Migrated from: TruthLens/utils/ai_services.py - trace_origin()
         """
-        prompt = f"""
-        As a digital investigator, analyze the potential origins of this content:
-        
-        CONTENT: "{text}"
-        
-        Analyze:
-        🕵️ LINGUISTIC PATTERNS: [Writing style, grammar, vocabulary clues]
-        📅 TEMPORAL CLUES: [References to dates, events, timing]
-        🌍 GEOGRAPHIC INDICATORS: [Location references, cultural context]
-        📱 PLATFORM INDICATORS: [Formatting, hashtags, platform-specific language]
-        🔄 PROPAGATION PATTERN: [How this might spread, typical vectors]
-        
-        Provide your best assessment of where/when this originated.
-        """
+        prompt = _ORIGIN_PROMPT.format(text=text)
         
         try:
             return await self._make_gemini_request(prompt, model="gemini-1.5-pro") or "Origin analysis unavailable"
@@ -154,20 +337,7 @@ class TextAnalyzer:
         Analyze missing context
         Migrated from: TruthLens/utils/ai_services.py - analyze_context()
         """
-        prompt = f"""
-        As a context analyst, identify what crucial context is missing from this content:
-        
-        CONTENT: "{text}"
-        
-        Identify:
-        📚 MISSING BACKGROUND: [What background info is needed?]
-        📊 MISSING DATA: [What statistics or data are omitted?]
-        ⏰ MISSING TIMELINE: [What timeline context is missing?]
-        🔗 MISSING CONNECTIONS: [What related events/facts aren't mentioned?]
-        📝 CHERRY-PICKING: [What contradictory evidence might exist?]
-        
-        Explain why this missing context matters for understanding the truth.
-        """
+        prompt = _CONTEXT_PROMPT.format(text=text)
         
         try:
             return await self._make_gemini_request(prompt, model="gemini-1.5-flash") or "Context analysis unavailable"
@@ -179,6 +349,23 @@ class TextAnalyzer:
         Search for fact-checked claims
         Migrated from: TruthLens/utils/ai_services.py - FactCheckService.search_claims()
         """
+        fact_checks = await self.lookup_fact_checks(query)
+        return [] if fact_checks is None else fact_checks
+    
+    async def lookup_fact_checks(self, query: str) -> Optional[List[Dict[str, str]]]:
+        """Like search_fact_checks, but None when the lookup failed rather than found nothing"""
+        query = query[:100]
+        key = hashlib.blake2b(query.encode(), digest_size=16).digest()
+        cached = _FACT_CHECK_CACHE.get(key)
+        if cached is None:
+            cached = await self._coalesced(('fact_check', key), lambda: self._fetch_fact_checks(query))
+            if cached is None:
+                return None
+            _FACT_CHECK_CACHE[key] = cached
+        return copy.deepcopy(cached)
+    
+    async def _fetch_fact_checks(self, query: str) -> Optional[List[Dict[str, str]]]:
+        """Query the Fact Check API; None on failure so errors are never cached"""
         try:
             params = {
                 'query': query[:100],
@@ -186,23 +373,22 @@ class TextAnalyzer:
                 'languageCode': 'en'
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.fact_check_url}/claims:search", 
-                    params=params,
-                    timeout=aiohttp.ClientTimeout(total=15)
-                ) as response:
-                    
-                    if response.status == 200:
-                        data = await response.json()
-                        return self._parse_fact_checks(data)
-                    else:
-                        logger.warning(f"Fact check API returned status {response.status}")
-                        return []
+            async with self.session.get(
+                f"{self.fact_check_url}/claims:search", 
+                params=params,
+                timeout=aiohttp.ClientTimeout(total=15)
+            ) as response:
+                
+                if response.status == 200:
+                    data = orjson.loads(await response.read())
+                    return self._parse_fact_checks(data)
+                else:
+                    logger.warning(f"Fact check API returned status {response.status}")
+                    return None
                         
         except Exception as e:
             logger.warning(f"Fact check search failed: {str(e)}")
-            return []
+            return None
     
     def _extract_sources_and_reporting(self, ai_response: str) -> Dict[str, List[Dict[str, str]]]:
         """
@@ -217,46 +403,25 @@ class TextAnalyzer:
         
         # Extract source links
         source_section = self._extract_section(ai_response, "🔗 SOURCE LINKS & ARTICLES:")
-        if source_section:
-            lines = source_section.split('\n')
-            for line in lines:
-                line = line.strip()
-                if line.startswith('-') and ':' in line:
-                    # Parse format: "- Source Name: [description] - [URL]"
-                    parts = line[1:].split(':', 1)
-                    if len(parts) == 2:
-                        source_name = parts[0].strip()
-                        description_url = parts[1].strip()
-                        
-                        # Split description and URL
-                        if ' - ' in description_url:
-                            desc, url = description_url.rsplit(' - ', 1)
-                            sources.append({
-                                'name': source_name,
-                                'description': desc.strip(),
-                                'url': url.strip()
-                            })
-                        else:
-                            sources.append({
-                                'name': source_name,
-                                'description': description_url,
-                                'url': ""
-                            })
+        for item in _LIST_ITEM_RE.finditer(source_section):
+            # Parse format: "- Source Name: [description] - [URL]"
+            description_url = item.group(2).strip()
+            desc, separator, url = description_url.rpartition(' - ')
+            sources.append({
+                'name': item.group(1).strip(),
+                'description': desc.strip() if separator else description_url,
+                'url': url.strip() if separator else ""
+            })
         
         # Extract reporting emails
         reporting_section = self._extract_section(ai_response, "📧 REPORTING INFORMATION:")
-        if reporting_section:
-            lines = reporting_section.split('\n')
-            for line in lines:
-                line = line.strip()
-                if line.startswith('-') and '@' in line:
-                    # Parse format: "- Description: email@domain.com"
-                    if ':' in line:
-                        desc, email = line[1:].split(':', 1)
-                        reporting_emails.append({
-                            'description': desc.strip(),
-                            'email': email.strip()
-                        })
+        for item in _LIST_ITEM_RE.finditer(reporting_section):
+            # Parse format: "- Description: email@domain.com"
+            if '@' in item.group(0):
+                reporting_emails.append({
+                    'description': item.group(1).strip(),
+                    'email': item.group(2).strip()
+                })
         
         return {
             'sources': sources,
@@ -265,18 +430,25 @@ class TextAnalyzer:
     
     def _extract_section(self, text: str, section_header: str) -> str:
         """Extract a specific section from AI response"""
-        lines = text.split('\n')
-        in_section = False
+        # The section starts on the line after the first header mention and runs to the next emoji-led line
+        start = text.find(section_header)
+        if start < 0:
+            return ""
+        start = text.find('\n', start) + 1
+        if not start:
+            return ""
+        if section_header not in text[start:]:
+            end_match = _SECTION_END_RE.search(text, start)
+            return text[start:end_match.start() if end_match else len(text)].strip()
+        
+        # Repeated header lines are skipped rather than ending the section
         section_content = []
-        
-        for line in lines:
+        for line in text[start:].split('\n'):
             if section_header in line:
-                in_section = True
                 continue
-            elif in_section and any(line.startswith(emoji) for emoji in ['🔍', '🧬', '📊', '🎯', '⚠️', '🛡️', '📋']):
+            elif line.startswith(_SECTION_TERMINATORS):
                 break
-            elif in_section:
-                section_content.append(line)
+            section_content.append(line)
         
         return '\n'.join(section_content).strip()
     
@@ -286,6 +458,29 @@ class TextAnalyzer:
         Migrated from: TruthLens/utils/ai_services.py - _make_request()
         Enhanced with async support and better error handling
         """
+        key = hashlib.blake2b(f"{model}|{prompt}".encode(), digest_size=16).digest()
+        cached = _GEMINI_CACHE.get(key)
+        if cached is None:
+            cached = await self._coalesced(('gemini', key), lambda: self._post_gemini(prompt, model))
+            if cached is not None:
+                _GEMINI_CACHE[key] = cached
+        return cached
+    
+    async def _coalesced(self, key: Tuple[str, bytes], call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await call(), joining an identical upstream request that is already in flight
+        so a burst of the same claim costs a single API round-trip
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield: one caller being cancelled must not cancel the call for the others
+        return await asyncio.shield(task)
+    
+    async def _post_gemini(self, prompt: str, model: str) -> Optional[str]:
+        """Send one generateContent request; None on failure so errors are never cached"""
         try:
             url = f"{self.base_url}/{model}:generateContent"
             headers = {
@@ -303,21 +498,34 @@ class TextAnalyzer:
                 }
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
+            await _GEMINI_LIMITER.acquire()
+            started = time.monotonic()
+            recorded = False  # each call feeds the limiter exactly once
+            try:
+                async with self.session.post(
                     url, 
                     headers=headers, 
                     json=data,
                     timeout=aiohttp.ClientTimeout(total=30)
                 ) as response:
+                    # Recorded after the body arrived, so a failed read counts only as a transport failure
+                    body = await response.read() if response.status == 200 else None
+                    _GEMINI_LIMITER.record(response.status, time.monotonic() - started, response.headers)
+                    recorded = True
                     
-                    if response.status == 200:
-                        result = await response.json()
+                    if body is not None:
+                        result = orjson.loads(body)
                         # Extract generated text from Gemini API response
                         return result['candidates'][0]['content']['parts'][0]['text']
                     else:
                         logger.error(f"Gemini API Error: {response.status}")
                         return None
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if not recorded:
+                    _GEMINI_LIMITER.record(None, time.monotonic() - started)
+                raise
+            finally:
+                _GEMINI_LIMITER.release()
                         
         except Exception as e:
             logger.error(f"Gemini API Exception: {str(e)}")
@@ -328,17 +536,14 @@ class TextAnalyzer:
         Parse fact check API response
         Migrated from: TruthLens/utils/ai_services.py - _parse_fact_checks()
         """
-        results = []
-        
-        if 'claims' in data:
-            for claim in data['claims'][:5]:  # Limit to 5 results
-                for review in claim.get('claimReview', []):
-                    results.append({
-                        'title': review.get('title', 'No title'),
-                        'url': review.get('url', ''),
-                        'publisher': review.get('publisher', {}).get('name', 'Unknown'),
-                        'verdict': review.get('textualRating', 'No verdict'),
-                        'date': review.get('reviewDate', 'Unknown date')
-                    })
-        
-        return results
\ No newline at end of file
+        return [
+            {
+                'title': review.get('title', 'No title'),
+                'url': review.get('url', ''),
+                'publisher': review.get('publisher', {}).get('name', 'Unknown'),
+                'verdict': review.get('textualRating', 'No verdict'),
+                'date': review.get('reviewDate', 'Unknown date')
+            }
+            for claim in data.get('claims', [])[:5]  # Limit to 5 results
+            for review in claim.get('claimReview', [])
+        ]
\ No newline at end of file
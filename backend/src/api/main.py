@@ -2,13 +2,14 @@
 import os
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from datetime import datetime
 import uvicorn
 
 from .routes import fact_check, upload, report, archive
 from .middleware.cors import setup_cors
 from .middleware.auth import setup_auth
+from ..analysis_engine.text_analysis import get_http_session, close_http_session
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -16,7 +17,8 @@ app = FastAPI(
     description="AI-Powered Misinformation Detection & Forensic Analysis Platform",
     version="2.0.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse  # large nested analysis payloads serialize faster
 )
 
 # Setup middleware
@@ -29,6 +31,16 @@ app.include_router(upload.router, prefix="/api", tags=["upload"])
 app.include_router(report.router, prefix="/api", tags=["report"])
 app.include_router(archive.router, prefix="/api", tags=["archive"])
 
+@app.on_event("startup")
+async def open_http_session():
+    """Create the pooled HTTP session shared by outbound API calls"""
+    app.state.http = get_http_session()
+
+@app.on_event("shutdown")
+async def shutdown_http_session():
+    """Close pooled connections on shutdown"""
+    await close_http_session()
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
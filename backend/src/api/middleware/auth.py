@@ -4,9 +4,12 @@ Authentication and authorization middleware for Truth Lab 2.0
 Compatible with SecurityService and validate_request dependency injection
 """
 
+import hmac
 import os
+import re
+import time
 import logging
-from typing import Optional
+from typing import Optional, Tuple
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import JSONResponse
@@ -14,6 +17,16 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Second-resolution UTC clock shared by all requests, refreshed when the second rolls over
+_now_cache = {"ts": 0, "iso": ""}
+
+def _utc_now() -> Tuple[int, str]:
+    """Current epoch second and its ISO-8601 UTC string, formatted at most once per second"""
+    ts = int(time.time())
+    if ts != _now_cache["ts"]:
+        _now_cache.update(ts=ts, iso=datetime.utcfromtimestamp(ts).isoformat())
+    return ts, _now_cache["iso"]
+
 class TruthLabAuthMiddleware(BaseHTTPMiddleware):
     """
     Truth Lab 2.0 authentication middleware
@@ -30,18 +43,24 @@ class TruthLabAuthMiddleware(BaseHTTPMiddleware):
         self.api_key = api_key
         self.protected_paths = ["/api/fact-check", "/api/upload", "/api/report"]
         self.public_paths = ["/", "/health", "/api/status", "/api/docs", "/api/redoc"]
+        # Public prefixes match whole path segments and "/" matches only itself,
+        # so the root entry no longer makes every route public
+        self._public_re = re.compile("|".join(
+            r"/\Z" if p == "/" else re.escape(p.rstrip("/")) + r"(?:/|\Z)" for p in self.public_paths
+        ))
         
     async def dispatch(self, request: Request, call_next):
         # Set default user context
         request.state.user = "public"
         request.state.user_type = "public"
         request.state.authenticated = False
-        request.state.request_id = f"req_{int(datetime.utcnow().timestamp())}"
+        ts, now_iso = _utc_now()
+        request.state.request_id = f"req_{ts}_{os.urandom(3).hex()}"
         
-        path = request.url.path
+        path = request.scope["path"]
         
         # Skip auth for public endpoints
-        if any(path.startswith(public_path) for public_path in self.public_paths):
+        if self._public_re.match(path):
             return await call_next(request)
         
         # API key authentication (optional, for production)
@@ -54,18 +73,19 @@ class TruthLabAuthMiddleware(BaseHTTPMiddleware):
                     {
                         "success": False,
                         "error": "API key required for this endpoint",
-                        "timestamp": datetime.utcnow().isoformat()
+                        "timestamp": now_iso
                     },
                     status_code=401
                 )
             
-            if provided_key != self.api_key:
+            # Compare bytes in constant time; str inputs would raise on non-ASCII header values
+            if not hmac.compare_digest(provided_key.encode(), self.api_key.encode()):
                 logger.warning(f"Invalid API key for path: {path}")
                 return JSONResponse(
                     {
                         "success": False, 
                         "error": "Invalid API key",
-                        "timestamp": datetime.utcnow().isoformat()
+                        "timestamp": now_iso
                     },
                     status_code=401
                 )
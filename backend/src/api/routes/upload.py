@@ -4,6 +4,7 @@ from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Form
 from pydantic import BaseModel, Field
 from typing import Optional, Literal, Dict, Any
 from datetime import datetime
+import functools
 import logging
 
 from ...analysis_engine.comprehensive_analysis import conduct_comprehensive_analysis
@@ -23,6 +24,11 @@ logger = logging.getLogger(__name__)
 security_service = SecurityService()
 archive_service = ArchiveService()
 
+@functools.lru_cache(maxsize=1)
+def _get_image_forensics() -> "ImageForensics":
+    """Shared forensics instance so concurrent uploads share its Vision batch queue"""
+    return ImageForensics(config={})
+
 # File constraints
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB as per PRD
 ALLOWED_TYPES = {
@@ -98,7 +104,7 @@ async def upload_file_analysis(
         # Image forensic analysis
         if file.content_type.startswith("image/") and ImageForensics:
             try:
-                image_forensics = ImageForensics(config={})
+                image_forensics = _get_image_forensics()
                 forensic_result = await image_forensics.analyze_image(contents, filename=file.filename)
                 analysis_results["forensic_analysis"] = forensic_result
                 analysis_results["risk_score"] = forensic_result.get("forensic_score", 50)
@@ -53,6 +53,7 @@ class Config:
     MAX_CONTENT_LENGTH = int(os.getenv("MAX_CONTENT_LENGTH", 10000))
     MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", 10))
     ANALYSIS_TIMEOUT = int(os.getenv("ANALYSIS_TIMEOUT", 30))
+    MIN_TEXT_LENGTH = int(os.getenv("MIN_TEXT_LENGTH", 20))  # shorter inputs skip the full pipeline
     
     # Rate Limiting
     RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "True").lower() == "true"
@@ -72,6 +73,12 @@ class Config:
     FACT_CHECK_BASE_URL = "https://factchecktools.googleapis.com/v1alpha1"
     NEWS_API_BASE_URL = "https://newsapi.org/v2"
     
+    # Gemini client-side throttling (requests per minute, adaptive concurrency bounds)
+    GEMINI_RPM_LIMIT = int(os.getenv("GEMINI_RPM_LIMIT", 60))
+    GEMINI_MIN_CONCURRENCY = int(os.getenv("GEMINI_MIN_CONCURRENCY", 1))
+    GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", 8))
+    GEMINI_LATENCY_TARGET = float(os.getenv("GEMINI_LATENCY_TARGET", 8.0))  # seconds
+    
     # Feature Flags
     ENABLE_ORIGIN_TRACKING = os.getenv("ENABLE_ORIGIN_TRACKING", "True").lower() == "true"
     ENABLE_CONTEXT_ANALYSIS = os.getenv("ENABLE_CONTEXT_ANALYSIS", "True").lower() == "true"
@@ -125,6 +132,7 @@ class Config:
             "max_content_length": cls.MAX_CONTENT_LENGTH,
             "max_batch_size": cls.MAX_BATCH_SIZE,
             "timeout": cls.ANALYSIS_TIMEOUT,
+            "min_text_length": cls.MIN_TEXT_LENGTH,
             "enable_origin_tracking": cls.ENABLE_ORIGIN_TRACKING,
             "enable_context_analysis": cls.ENABLE_CONTEXT_ANALYSIS,
             "enable_image_analysis": cls.ENABLE_IMAGE_ANALYSIS,
@@ -194,7 +194,7 @@ class SecurityService:
             safety_score -= 10
         
         # Check for excessive caps (shouting)
-        caps_ratio = sum(1 for c in content if c.isupper()) / len(content) if len(content) > 0 else 0
+        caps_ratio = sum(map(str.isupper, content)) / len(content) if len(content) > 0 else 0
         if caps_ratio > 0.5:
             flagged_categories.append('aggressive_tone')
             safety_score -= 20
@@ -0,0 +1,30 @@
+# Regression tests for SourceTracker platform detection
+
+from src.analysis_engine.source_tracking import SourceTracker
+
+
+def _platform_report(content: str) -> str:
+    return SourceTracker()._identify_platform_origins(content.lower())
+
+
+def test_overlapping_hashtags_credit_every_platform():
+    """#fyp / #foryou must still count for TikTok when the broader #\\w+ hashtag pattern matches the same text"""
+    report = _platform_report("Watch this #foryoupage #fypシ now")
+    assert report.splitlines() == [
+        "• Twitter: 2 indicators (#foryoupage, #fypシ...)",
+        "• Instagram: 2 indicators (#foryoupage, #fypシ...)",
+        "• Tiktok: 2 indicators (#fyp, #foryou...)",
+    ]
+
+
+def test_pattern_inside_longer_match_is_counted():
+    """'channel:' overlaps the longer 'subscribe to my channel' match and still credits Telegram"""
+    report = _platform_report("Please subscribe to my channel: news")
+    assert "• Telegram: 1 indicators (channel:...)" in report.splitlines()
+    assert "• Youtube: 1 indicators (subscribe to my channel...)" in report.splitlines()
+
+
+def test_overlapping_dates_are_all_reported():
+    """Each date pattern scans on its own, so a DD/MM/YYYY and a YYYY/MM/DD sharing digits both count"""
+    report = SourceTracker()._analyze_temporal_patterns("12/05/2023/06/07", frozenset())
+    assert "• Date references found: 12/05/2023, 2023/06/07" in report.splitlines()